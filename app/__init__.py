@@ -1,4 +1,13 @@
-from .manager import Manager
-from .models import init_db
-
 __all__ = ["init_db", "Manager"]
+
+
+def __getattr__(name: str):
+    if name == "Manager":
+        from .manager import Manager
+
+        return Manager
+    if name == "init_db":
+        from .models import init_db
+
+        return init_db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,290 @@
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+from sqlalchemy import delete, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import History, SessionLocal, init_db
+from .models.database import init_engine
+from config import Env
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = {
+    History.id.name: np.int64,
+    History.timestamp.name: "datetime64[ns]",
+    History.balance.name: np.float64,
+    History.price.name: np.float64,
+    History.ratio.name: np.float64,
+}
+INCREMENTAL = 2
+
+
+class HistoryArchive:
+    def __init__(self, root: str | Path | None = None) -> None:
+        self.root = Path(root or os.path.join(Env.DATA_DIR, "archive"))
+
+    def markets(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+
+    def write_rows(self, rows: list[tuple]) -> None:
+        rows_by_market = defaultdict(list)
+        for id, market, *row in rows:
+            rows_by_market[market].append((id, *row))
+
+        for market, market_rows in rows_by_market.items():
+            self.write(
+                market,
+                {
+                    name: np.array(values, dtype=dtype)
+                    for (name, dtype), values in zip(COLUMNS.items(), zip(*market_rows))
+                },
+            )
+
+    def write(self, market: str, columns: dict[str, np.ndarray]) -> None:
+        order = np.argsort(columns[History.timestamp.name], kind="stable")
+        columns = {name: values[order] for name, values in columns.items()}
+
+        months = columns[History.timestamp.name].astype("datetime64[M]")
+        splits = np.flatnonzero(months[1:] != months[:-1]) + 1
+        for start, end in zip([0, *splits], [*splits, len(months)]):
+            self.write_segment(
+                market,
+                str(months[start]),
+                {name: values[start:end] for name, values in columns.items()},
+            )
+
+    def write_segment(
+        self, market: str, month: str, columns: dict[str, np.ndarray]
+    ) -> None:
+        directory = self.root / market / month
+        segment = directory / f"{columns[History.id.name][0]:012d}"
+        partial = directory / f".{segment.name}.partial"
+        stale = directory / f".{segment.name}.old"
+        self.finish_swap(segment)
+
+        if segment.exists():
+            ids = columns[History.id.name]
+            existing = {name: np.load(segment / f"{name}.npy") for name in COLUMNS}
+            kept = ~np.isin(existing[History.id.name], ids)
+            merged = {
+                name: np.concatenate([existing[name][kept], values])
+                for name, values in columns.items()
+            }
+            order = np.argsort(merged[History.timestamp.name], kind="stable")
+            columns = {name: values[order] for name, values in merged.items()}
+
+        shutil.rmtree(partial, ignore_errors=True)
+        partial.mkdir(parents=True)
+        for name, values in columns.items():
+            np.save(partial / f"{name}.npy", values)
+
+        if segment.exists():
+            segment.rename(stale)
+        partial.rename(segment)
+        shutil.rmtree(stale, ignore_errors=True)
+
+    @staticmethod
+    def finish_swap(segment: Path) -> None:
+        stale = segment.with_name(f".{segment.name}.old")
+        if not stale.exists():
+            return
+        if not segment.exists():
+            segment.with_name(f".{segment.name}.partial").rename(segment)
+        shutil.rmtree(stale)
+
+    def segments(
+        self,
+        market: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[dict[str, np.ndarray]]:
+        directory = self.root / market
+        if not directory.exists():
+            return
+
+        first = np.datetime64(start, "M") if start else None
+        last = np.datetime64(end, "M") if end else None
+        for month in sorted(directory.iterdir()):
+            if first is not None and np.datetime64(month.name, "M") < first:
+                continue
+            if last is not None and np.datetime64(month.name, "M") > last:
+                break
+
+            for stale in month.glob(".*.old"):
+                self.finish_swap(month / stale.name[1:-4])
+
+            for segment in sorted(month.iterdir()):
+                if segment.name.startswith("."):
+                    continue
+
+                columns = {
+                    name: np.load(segment / f"{name}.npy", mmap_mode="r")
+                    for name in COLUMNS
+                }
+                timestamps = columns[History.timestamp.name]
+                lo, hi = 0, len(timestamps)
+                if start:
+                    lo = np.searchsorted(timestamps, np.datetime64(start, "ns"))
+                if end:
+                    hi = np.searchsorted(
+                        timestamps, np.datetime64(end, "ns"), side="right"
+                    )
+                if lo < hi:
+                    yield {name: values[lo:hi] for name, values in columns.items()}
+
+    def memmap(
+        self,
+        market: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[str, np.ndarray]:
+        segments = list(self.segments(market, start, end))
+        if not segments:
+            return {name: np.array([], dtype=dtype) for name, dtype in COLUMNS.items()}
+        if len(segments) == 1:
+            return segments[0]
+
+        n_rows = sum(len(segment[History.id.name]) for segment in segments)
+        directory = tempfile.mkdtemp(prefix="archive-")
+        try:
+            columns = {
+                name: np.lib.format.open_memmap(
+                    os.path.join(directory, f"{name}.npy"),
+                    mode="w+",
+                    dtype=dtype,
+                    shape=(n_rows,),
+                )
+                for name, dtype in COLUMNS.items()
+            }
+        finally:
+            shutil.rmtree(directory)
+
+        offset = 0
+        for segment in segments:
+            n = len(segment[History.id.name])
+            for name, values in segment.items():
+                columns[name][offset : offset + n] = values
+            offset += n
+        return columns
+
+
+async def high_water_id(session: AsyncSession) -> int | None:
+    try:
+        return await session.scalar(
+            text("SELECT seq FROM sqlite_sequence WHERE name = :name"),
+            {"name": History.__tablename__},
+        )
+    except OperationalError:
+        return None
+
+
+async def archive_histories(
+    archive: HistoryArchive,
+    horizon: timedelta,
+    chunk_size: int = 50_000,
+) -> int:
+    cutoff = datetime.now() - horizon
+    columns = [getattr(History, name) for name in COLUMNS]
+    columns.insert(1, History.market)
+    n_rows = 0
+
+    async with SessionLocal() as session:
+        if await high_water_id(session) is None:
+            logger.error(
+                f"{History.__tablename__} has no AUTOINCREMENT sequence to keep ids "
+                "unique after archiving, run migration.py first"
+            )
+            return 0
+
+    while True:
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(*columns)
+                .where(History.timestamp < cutoff, History.market.is_not(None))
+                .order_by(History.id.asc())
+                .limit(chunk_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            await asyncio.to_thread(archive.write_rows, rows)
+            await session.execute(
+                delete(History).where(
+                    History.id.between(rows[0].id, rows[-1].id),
+                    History.timestamp < cutoff,
+                    History.market.is_not(None),
+                )
+            )
+            await session.commit()
+
+        n_rows += len(rows)
+        logger.info(f"archived {n_rows} history rows older than {cutoff}")
+
+    if n_rows:
+        await reclaim_space()
+    return n_rows
+
+
+async def reclaim_space(pages: int = 2048) -> int:
+    async with init_engine().connect() as conn:
+        if await conn.scalar(text("PRAGMA auto_vacuum")) != INCREMENTAL:
+            logger.warning("auto_vacuum is not incremental, run a full vacuum once")
+            return 0
+
+        raw = await conn.get_raw_connection()
+        freed = 0
+        while free := await conn.scalar(text("PRAGMA freelist_count")):
+            await raw.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({pages});"
+            )
+            freed += min(free, pages)
+            await asyncio.sleep(0)
+        await conn.scalar(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+    logger.info(f"reclaimed {freed} database pages")
+    return freed
+
+
+async def vacuum() -> None:
+    async with init_engine().connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+        await conn.execute(text("VACUUM"))
+
+
+async def main(args: argparse.Namespace) -> None:
+    await init_db(args.data_dir)
+    if args.vacuum:
+        await vacuum()
+
+    data_dir = args.data_dir or Env.DATA_DIR
+    archive = HistoryArchive(args.archive_dir or os.path.join(data_dir, "archive"))
+    n_rows = await archive_histories(archive, timedelta(days=args.days))
+    print(f"Archived {n_rows} history rows to {archive.root}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old history rows")
+    parser.add_argument("--days", type=int, default=Env.ARCHIVE_DAYS)
+    parser.add_argument("--data-dir", default=None, help="directory holding app.db")
+    parser.add_argument("--archive-dir", default=None)
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="rebuild app.db once so later runs can vacuum incrementally",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,12 @@
+from .broker import SimulatedBroker
+from .data import load_archived_prices, load_prices, normalize_prices
+from .engine import Backtester, BacktestResult
+
+__all__ = [
+    "SimulatedBroker",
+    "load_archived_prices",
+    "load_prices",
+    "normalize_prices",
+    "Backtester",
+    "BacktestResult",
+]
@@ -0,0 +1,65 @@
+import argparse
+import json
+import time
+
+from . import Backtester, load_archived_prices, load_prices
+from app.archive import HistoryArchive
+from app.data_processor import DataProcessor
+from app.strategy import GridStrategy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay prices through the grid")
+    parser.add_argument("prices", help="CSV or Parquet candles or ticks")
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="treat PRICES as a history archive directory and replay --ticker",
+    )
+    parser.add_argument("--ticker", default="KRW-BTC")
+    parser.add_argument("--cash", type=float, default=1_000_000)
+    parser.add_argument("--quantity", type=float, default=0.0)
+    parser.add_argument("--pivot", type=float, default=None)
+    parser.add_argument("--fee", type=float, default=0.0005)
+    parser.add_argument("--profit-threshold", type=float, default=0.005)
+    parser.add_argument("--min-order", type=float, default=5000)
+    parser.add_argument("--ratio-exponent", type=float, default=2)
+    parser.add_argument("--max-ratio", type=float, default=0.875)
+    parser.add_argument("--histories", help="write the trade histories to CSV")
+    parser.add_argument("--plot", help="write the trend plot to PNG")
+    args = parser.parse_args()
+
+    strategy = GridStrategy(
+        profit_threshold=args.profit_threshold,
+        min_order=args.min_order,
+        ratio_exponent=args.ratio_exponent,
+        max_ratio=args.max_ratio,
+    )
+    backtester = Backtester(args.ticker, strategy, fee=args.fee)
+
+    if args.archive:
+        timestamps, prices = load_archived_prices(
+            HistoryArchive(args.prices), args.ticker
+        )
+        start = time.perf_counter()
+        result = backtester.run_ticks(
+            timestamps, prices, args.cash, args.quantity, args.pivot
+        )
+    else:
+        prices = load_prices(args.prices)
+        start = time.perf_counter()
+        result = backtester.run(prices, args.cash, args.quantity, args.pivot)
+    elapsed = time.perf_counter() - start
+
+    summary = result.summary() | {"rows": len(prices), "seconds": elapsed}
+    print(json.dumps(summary, indent=2))
+
+    if args.histories:
+        result.histories.to_csv(args.histories, index=False)
+    if args.plot and result.n_trades > 1:
+        with open(args.plot, "wb") as f:
+            f.write(DataProcessor.generate_trend_plot(result.histories).getvalue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class SimulatedBroker:
+    cash: float
+    quantity: float = 0.0
+    fee: float = 0.0005
+
+    def buy(self, price: float, quantity: float) -> float:
+        quantity = min(quantity, self.cash / (price * (1 + self.fee)))
+        self.cash -= price * quantity * (1 + self.fee)
+        self.quantity += quantity
+        return quantity
+
+    def sell(self, price: float, quantity: float) -> float:
+        quantity = min(quantity, self.quantity)
+        self.cash += price * quantity * (1 - self.fee)
+        self.quantity -= quantity
+        return quantity
+
+    def value(self, price: float) -> float:
+        return self.cash + self.quantity * price
@@ -0,0 +1,62 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.archive import HistoryArchive
+from app.models import History
+
+COLUMN_ALIASES = {
+    "candle_date_time_utc": "timestamp",
+    "candle_date_time_kst": "timestamp",
+    "time": "timestamp",
+    "date": "timestamp",
+    "opening_price": "open",
+    "high_price": "high",
+    "low_price": "low",
+    "trade_price": "close",
+    "price": "close",
+}
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+def load_prices(path: str | Path) -> pd.DataFrame:
+    path = Path(path)
+    if path.suffix == ".parquet":
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path)
+    return normalize_prices(frame)
+
+
+def normalize_prices(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.rename(
+        columns={
+            column: COLUMN_ALIASES[column]
+            for column in frame.columns
+            if column in COLUMN_ALIASES and COLUMN_ALIASES[column] not in frame
+        }
+    )
+    if "timestamp" not in frame or "close" not in frame:
+        raise ValueError("Price data needs a timestamp and a close or price column")
+
+    for column in PRICE_COLUMNS:
+        if column not in frame:
+            frame[column] = frame["close"]
+
+    frame = frame[["timestamp", *PRICE_COLUMNS]].copy()
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"])
+    frame[PRICE_COLUMNS] = frame[PRICE_COLUMNS].astype(float)
+    return frame.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+
+def load_archived_prices(
+    archive: HistoryArchive,
+    market: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    columns = archive.memmap(market, start, end)
+    return columns[History.timestamp.name], columns[History.price.name]
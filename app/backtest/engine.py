@@ -0,0 +1,242 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .broker import SimulatedBroker
+from app.models import History
+from app.strategy import GridStrategy
+from app.utils import get_tick_table
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BacktestResult:
+    histories: pd.DataFrame
+    equity: pd.Series
+    initial_balance: float
+    pivot_price: float
+
+    @property
+    def n_trades(self) -> int:
+        return len(self.histories)
+
+    @property
+    def total_return(self) -> float:
+        return self.equity.iloc[-1] / self.initial_balance - 1
+
+    @property
+    def max_drawdown(self) -> float:
+        equity = np.concatenate([[self.initial_balance], self.equity.to_numpy()])
+        return float(np.max(1 - equity / np.maximum.accumulate(equity)))
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "initial_balance": self.initial_balance,
+            "final_balance": float(self.equity.iloc[-1]),
+            "total_return": float(self.total_return),
+            "max_drawdown": self.max_drawdown,
+            "n_trades": self.n_trades,
+            "pivot_price": self.pivot_price,
+        }
+
+
+class Backtester:
+    SCAN_CHUNK = 1024
+
+    def __init__(
+        self,
+        ticker: str,
+        strategy: GridStrategy | None = None,
+        fee: float = 0.0005,
+    ) -> None:
+        self.ticker = ticker
+        self.strategy = strategy or GridStrategy()
+        self.fee = fee
+        self.table = get_tick_table(ticker)
+
+    def run(
+        self,
+        prices: pd.DataFrame,
+        cash: float,
+        quantity: float = 0.0,
+        pivot_price: float | None = None,
+    ) -> BacktestResult:
+        timestamps = prices["timestamp"].to_numpy(dtype="datetime64[ns]")
+        opens, highs, lows, closes = (
+            prices[column].to_numpy(dtype=float)
+            for column in ("open", "high", "low", "close")
+        )
+        return self.run_arrays(
+            timestamps, opens, highs, lows, closes, cash, quantity, pivot_price
+        )
+
+    def run_ticks(
+        self,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        cash: float,
+        quantity: float = 0.0,
+        pivot_price: float | None = None,
+    ) -> BacktestResult:
+        return self.run_arrays(
+            timestamps, prices, prices, prices, prices, cash, quantity, pivot_price
+        )
+
+    def run_arrays(
+        self,
+        timestamps: np.ndarray,
+        opens: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        cash: float,
+        quantity: float = 0.0,
+        pivot_price: float | None = None,
+    ) -> BacktestResult:
+        low_first = closes >= opens
+
+        strategy, table = self.strategy, self.table
+        broker = SimulatedBroker(cash, quantity, self.fee)
+        pivot = pivot_price or float(opens[0])
+        fills: list[tuple[int, float, float, float]] = []
+
+        def record(index: int, price: float) -> None:
+            fills.append((index, broker.cash, broker.quantity, price))
+
+        cur_price = float(opens[0])
+        last_price = strategy.optimal_price(
+            table, cur_price, broker.cash, broker.quantity, pivot
+        )
+        volume = strategy.calc_volume(cur_price, broker.cash, broker.quantity, pivot)
+        if (
+            strategy.is_trade_profitable(last_price, cur_price)
+            and abs(volume) >= strategy.min_order
+        ):
+            if volume > 0:
+                broker.buy(cur_price, volume / cur_price)
+            else:
+                broker.sell(cur_price, -volume / cur_price)
+            record(0, cur_price)
+            last_price = strategy.optimal_price(
+                table, cur_price, broker.cash, broker.quantity, pivot
+            )
+        pivot = strategy.next_pivot(last_price, pivot)
+
+        cursor, side = 0, None
+        while True:
+            lower_price, upper_price = strategy.order_prices(
+                table, last_price, broker.cash, broker.quantity, pivot
+            )
+            if lower_price is None or upper_price is None:
+                logger.warning(f"No order prices around {last_price} for {self.ticker}")
+                break
+
+            index, bought = self.next_fill(
+                lows, highs, low_first, lower_price, upper_price, cursor, side
+            )
+            if index is None:
+                break
+
+            if bought:
+                volume = strategy.calc_volume(
+                    lower_price, broker.cash, broker.quantity, pivot
+                )
+                broker.buy(lower_price, volume / lower_price)
+                last_price = lower_price
+            else:
+                volume = -strategy.calc_volume(
+                    upper_price, broker.cash, broker.quantity, pivot
+                )
+                broker.sell(upper_price, volume / upper_price)
+                last_price = upper_price
+
+            pivot = strategy.next_pivot(last_price, pivot)
+            record(index, last_price)
+            cursor, side = index, bought
+
+        return BacktestResult(
+            histories=self.build_histories(timestamps, fills),
+            equity=self.build_equity(timestamps, closes, cash, quantity, fills),
+            initial_balance=cash + quantity * float(opens[0]),
+            pivot_price=pivot,
+        )
+
+    def next_fill(
+        self,
+        lows: np.ndarray,
+        highs: np.ndarray,
+        low_first: np.ndarray,
+        lower_price: float,
+        upper_price: float,
+        cursor: int,
+        side: bool | None,
+    ) -> tuple[int | None, bool | None]:
+        if side is True and lows[cursor] <= lower_price:
+            return cursor, True
+        if side is False and highs[cursor] >= upper_price:
+            return cursor, False
+
+        start = cursor if side is None else cursor + 1
+        index = self.scan(lows, highs, lower_price, upper_price, start)
+        if index is None:
+            return None, None
+
+        buy_hit = lows[index] <= lower_price
+        sell_hit = highs[index] >= upper_price
+        return index, bool(buy_hit and (not sell_hit or low_first[index]))
+
+    def scan(
+        self,
+        lows: np.ndarray,
+        highs: np.ndarray,
+        lower_price: float,
+        upper_price: float,
+        start: int,
+    ) -> int | None:
+        size = self.SCAN_CHUNK
+        while start < len(lows):
+            stop = min(start + size, len(lows))
+            hits = lows[start:stop] <= lower_price
+            hits |= highs[start:stop] >= upper_price
+            offset = int(hits.argmax())
+            if hits[offset]:
+                return start + offset
+            start, size = stop, size * 2
+        return None
+
+    @staticmethod
+    def build_histories(
+        timestamps: np.ndarray, fills: list[tuple[int, float, float, float]]
+    ) -> pd.DataFrame:
+        fill_array = np.array(fills, dtype=float).reshape(-1, 4)
+        indices = fill_array[:, 0].astype(int)
+        cash, quantity, prices = fill_array[:, 1], fill_array[:, 2], fill_array[:, 3]
+        balances = cash + quantity * prices
+        return pd.DataFrame(
+            {
+                History.timestamp.name: timestamps[indices],
+                History.balance.name: balances,
+                History.price.name: prices,
+                History.ratio.name: cash / balances,
+            }
+        )
+
+    @staticmethod
+    def build_equity(
+        timestamps: np.ndarray,
+        closes: np.ndarray,
+        cash: float,
+        quantity: float,
+        fills: list[tuple[int, float, float, float]],
+    ) -> pd.Series:
+        fill_array = np.array(fills, dtype=float).reshape(-1, 4)
+        indices = fill_array[:, 0].astype(int)
+        cash_states = np.concatenate([[cash], fill_array[:, 1]])
+        quantity_states = np.concatenate([[quantity], fill_array[:, 2]])
+
+        states = np.searchsorted(indices, np.arange(len(closes)), side="right")
+        equity = cash_states[states] + quantity_states[states] * closes
+        return pd.Series(equity, index=pd.DatetimeIndex(timestamps), name="equity")
@@ -0,0 +1,199 @@
+import argparse
+import itertools
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .data import PRICE_COLUMNS, load_prices
+from .engine import Backtester
+from app.strategy import GridStrategy
+
+STRATEGY_PARAMS = ("profit_threshold", "min_order", "ratio_exponent", "max_ratio")
+SWEEP_PARAMS = (*STRATEGY_PARAMS, "pivot_price")
+
+_prices: dict[str, np.ndarray] = {}
+_shm: shared_memory.SharedMemory | None = None
+
+
+class SharedPrices:
+    def __init__(self, prices: pd.DataFrame) -> None:
+        self.length = len(prices)
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=max(self.length * 8 * (1 + len(PRICE_COLUMNS)), 1)
+        )
+        timestamps, columns = self.views(self.shm.buf, self.length)
+        timestamps[:] = prices["timestamp"].to_numpy(dtype="datetime64[ns]")
+        columns[:] = prices[PRICE_COLUMNS].to_numpy(dtype=float).T
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @staticmethod
+    def views(buffer: memoryview, length: int) -> tuple[np.ndarray, np.ndarray]:
+        timestamps = np.ndarray((length,), dtype="datetime64[ns]", buffer=buffer)
+        columns = np.ndarray(
+            (len(PRICE_COLUMNS), length),
+            dtype=np.float64,
+            buffer=buffer,
+            offset=length * 8,
+        )
+        return timestamps, columns
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach(name: str, length: int) -> None:
+    global _shm
+    _shm = shared_memory.SharedMemory(name=name)
+    timestamps, columns = SharedPrices.views(_shm.buf, length)
+    _prices["timestamp"] = timestamps
+    _prices.update(zip(PRICE_COLUMNS, columns))
+
+
+def evaluate(
+    params: dict[str, float], ticker: str, cash: float, fee: float
+) -> dict[str, Any]:
+    strategy = GridStrategy(
+        **{key: params[key] for key in STRATEGY_PARAMS if key in params}
+    )
+    result = Backtester(ticker, strategy, fee).run_arrays(
+        _prices["timestamp"],
+        _prices["open"],
+        _prices["high"],
+        _prices["low"],
+        _prices["close"],
+        cash,
+        pivot_price=params.get("pivot_price"),
+    )
+    return params | result.summary()
+
+
+def grid_search(space: dict[str, list[float]]) -> Iterator[dict[str, float]]:
+    keys = list(space)
+    for values in itertools.product(*(space[key] for key in keys)):
+        yield dict(zip(keys, values))
+
+
+def random_search(
+    space: dict[str, tuple[float, float]], n_samples: int, seed: int | None = None
+) -> Iterator[dict[str, float]]:
+    rng = random.Random(seed)
+    for _ in range(n_samples):
+        yield {key: rng.uniform(lo, hi) for key, (lo, hi) in space.items()}
+
+
+def sweep(
+    prices: pd.DataFrame,
+    candidates: Iterable[dict[str, float]],
+    ticker: str = "KRW-BTC",
+    cash: float = 1_000_000,
+    fee: float = 0.0005,
+    workers: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    workers = workers or os.cpu_count() or 1
+    shared = SharedPrices(prices)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=attach, initargs=(shared.name, len(prices))
+        ) as executor:
+            candidates = iter(candidates)
+            pending = set()
+
+            while True:
+                for params in itertools.islice(candidates, 2 * workers - len(pending)):
+                    pending.add(executor.submit(evaluate, params, ticker, cash, fee))
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        shared.close()
+
+
+def rank(results: Iterable[dict[str, Any]]) -> pd.DataFrame:
+    table = pd.DataFrame(list(results))
+    if table.empty:
+        return table
+    table["return_rank"] = table["total_return"].rank(ascending=False)
+    table["drawdown_rank"] = table["max_drawdown"].rank()
+    table["rank"] = (table["return_rank"] + table["drawdown_rank"]).rank(method="min")
+    return table.sort_values(["rank", "total_return"], ascending=[True, False])
+
+
+def parse_space(specs: list[str], random_ranges: bool) -> dict[str, Any]:
+    space = {}
+    for spec in specs:
+        key, _, values = spec.partition("=")
+        if key not in SWEEP_PARAMS:
+            raise ValueError(f"Unknown parameter {key}, expected one of {SWEEP_PARAMS}")
+        if random_ranges:
+            lo, hi = values.split(":")
+            space[key] = (float(lo), float(hi))
+        else:
+            space[key] = [float(value) for value in values.split(",")]
+    return space
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep grid strategy parameters")
+    parser.add_argument("prices", help="CSV or Parquet candles or ticks")
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help="name=v1,v2,... for a grid, or name=lo:hi with --random",
+    )
+    parser.add_argument("--random", type=int, help="number of random samples")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--ticker", default="KRW-BTC")
+    parser.add_argument("--cash", type=float, default=1_000_000)
+    parser.add_argument("--fee", type=float, default=0.0005)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="stream results to this CSV file")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    prices = load_prices(args.prices)
+    space = parse_space(args.param, args.random is not None)
+    if args.random is not None:
+        candidates = random_search(space, args.random, args.seed)
+    else:
+        candidates = grid_search(space)
+
+    results = []
+    out = open(args.out, "w") if args.out else None
+    try:
+        for i, result in enumerate(
+            sweep(prices, candidates, args.ticker, args.cash, args.fee, args.workers)
+        ):
+            if out:
+                pd.DataFrame([result]).to_csv(out, header=i == 0, index=False)
+                out.flush()
+            results.append(result)
+            print(
+                f"[{i + 1}] return={result['total_return']:.4f} "
+                f"drawdown={result['max_drawdown']:.4f}",
+                file=sys.stderr,
+            )
+    finally:
+        if out:
+            out.close()
+
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(rank(results).head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
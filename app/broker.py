@@ -1,96 +1,234 @@
+import asyncio
 import hashlib
-import uuid as uuid_lib
-from typing import Literal
+import logging
+import time
+from typing import Any, Literal
 from urllib.parse import urljoin, urlencode, unquote
 
-import aiohttp
-import jwt
+from pydantic import TypeAdapter
+
+from .schemas import (
+    Balance,
+    Order,
+    FGI,
+    JSONAdapter,
+    TickerList,
+    BalanceList,
+    OrderAdapter,
+    OrderList,
+    FGIAdapter,
+)
+from .streams import TickerStream, OrderStream
+from .rate_limiter import RateLimiter, Priority
+from .transport import TransportConfig, create_session
+from config import Env
+from .utils import retry, metrics, Batcher, CircuitBreaker, JWTSigner, TTLCache
 
-from app.schemas.schemas import FGIResponse
+logger = logging.getLogger(__name__)
 
-from .schemas import Balance, Order, FGI
-from config import Env
-from .utils import retry
+class APIError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"{status}: {message}")
+        self.status = status
 
 
 class Broker:
-    def __init__(self):
+    TICKER_TTL = 1.0
+    BALANCES_TTL = 5.0
+    FGI_TTL = 300.0
+    MAX_REQUEUES = 3
+    CIRCUITS = {
+        "fetch_current_prices": "quotation",
+        "fetch_balances": "default",
+        "get_order": "default",
+        "fetch_orders": "default",
+        "place_order": "order",
+        "cancel_order": "default",
+        "cancel_orders": "order-cancel-all",
+    }
+
+    def __init__(
+        self,
+        upbit_url: str = "https://api.upbit.com",
+        upbit_ws_url: str = "wss://api.upbit.com/websocket/v1",
+        upbit_private_ws_url: str = "wss://api.upbit.com/websocket/v1/private",
+        datalab_url: str = "https://datalab-api.upbit.com",
+        transport: TransportConfig | None = None,
+    ):
         self.ACCESS = Env.ACCESS
         self.SECRET = Env.SECRET
-        self.upbit_url = "https://api.upbit.com"
-        self.datalab_url = "https://datalab-api.upbit.com"
+        self.signer = JWTSigner(self.ACCESS, self.SECRET)
+        self.upbit_url = upbit_url
+        self.upbit_ws_url = upbit_ws_url
+        self.upbit_private_ws_url = upbit_private_ws_url
+        self.datalab_url = datalab_url
+        self.transport = transport or TransportConfig()
+
+        self.circuits = {
+            group: CircuitBreaker() for group in set(self.CIRCUITS.values())
+        }
+        for name, group in self.CIRCUITS.items():
+            method = retry(circuit_breaker=self.circuits[group])(getattr(self, name))
+            setattr(self, name, method)
+
+        self.rate_limiter = RateLimiter()
+        self.cache = TTLCache()
+        self.ticker_batcher = Batcher(self.fetch_current_prices)
+        self.order_batcher = Batcher(self.fetch_orders)
+        self.ticker_stream = TickerStream(self.upbit_ws_url)
+        self.order_stream = OrderStream(
+            self.upbit_private_ws_url,
+            self.generate_authorization,
+            on_closed=lambda uuid, state: self.invalidate_balances(),
+            on_trade=lambda uuid: self.invalidate_balances(),
+        )
 
     def initialize(self):
-        self.session = aiohttp.ClientSession()
+        self.session = create_session(self.transport)
+        self.ticker_stream.start(self.session)
+        self.order_stream.start(self.session)
 
     async def request(
-        self, method: Literal["GET", "POST", "DELETE"], url: str, **kwargs
-    ):
-        async with self.session.request(method=method, url=url, **kwargs) as response:
-            return await response.json()
-
-    @retry()
+        self,
+        method: Literal["GET", "POST", "DELETE"],
+        url: str,
+        group: str | None = None,
+        priority: Priority = Priority.READ,
+        adapter: TypeAdapter = JSONAdapter,
+        **kwargs,
+    ) -> Any:
+        for attempt in range(self.MAX_REQUEUES + 1):
+            if group is not None:
+                start = time.perf_counter()
+                await self.rate_limiter.acquire(group, priority)
+                metrics.histogram("rate_limit_wait_seconds", group=group).record(
+                    time.perf_counter() - start
+                )
+
+            start = time.perf_counter()
+            async with self.session.request(
+                method=method, url=url, **kwargs
+            ) as response:
+                endpoint = f"{method} {response.url.path}"
+                metrics.counter("upbit_requests_total", endpoint=endpoint).inc()
+                self.rate_limiter.update(
+                    response.headers.get("Remaining-Req"), response.status
+                )
+
+                if response.status == 429:
+                    metrics.counter("upbit_throttled_total", endpoint=endpoint).inc()
+                    if group is not None and attempt < self.MAX_REQUEUES:
+                        self.rate_limiter.throttle(group)
+                        continue
+                if response.status >= 400:
+                    raise APIError(response.status, await response.text())
+                result = adapter.validate_json(await response.read())
+
+            metrics.histogram("upbit_request_seconds", endpoint=endpoint).record(
+                time.perf_counter() - start
+            )
+            return result
+
+    @metrics.timed("broker_call_seconds")
     async def get_current_price(self, ticker: str) -> float:
-        params = {"markets": ticker}
+        price = self.ticker_stream.get_price(ticker)
+        if price is not None:
+            return price
+
+        await self.ticker_stream.subscribe(ticker)
+        return await self.cache.get(
+            ("ticker", ticker),
+            lambda: self.ticker_batcher.get(ticker),
+            self.TICKER_TTL,
+        )
+
+    async def fetch_current_prices(self, tickers: list[str]) -> dict[str, float]:
+        params = {"markets": ",".join(tickers)}
         url = urljoin(self.upbit_url, "/v1/ticker")
 
-        response = await self.request("GET", url, params=params)
-        return response[0]["trade_price"]
+        response = await self.request(
+            "GET", url, group="quotation", adapter=TickerList, params=params
+        )
+        return {ticker.market: ticker.trade_price for ticker in response}
 
-    @retry()
+    @metrics.timed("broker_call_seconds")
     async def get_balances(self) -> dict[str, Balance]:
+        return await self.cache.get("balances", self.fetch_balances, self.BALANCES_TTL)
+
+    def invalidate_balances(self) -> None:
+        self.cache.invalidate("balances")
+
+    async def fetch_balances(self) -> dict[str, Balance]:
         headers = {"Authorization": self.generate_authorization()}
         url = urljoin(self.upbit_url, "/v1/accounts")
 
-        response = await self.request("GET", url, headers=headers)
-        balances = [Balance.model_validate(item) for item in response]
+        balances = await self.request(
+            "GET", url, group="default", adapter=BalanceList, headers=headers
+        )
         return {balance.currency: balance for balance in balances}
 
-    @retry()
+    @metrics.timed("broker_call_seconds")
     async def get_order(self, uuid: str) -> Order:
         params = {"uuid": uuid}
         headers = {"Authorization": self.generate_authorization(params=params)}
         url = urljoin(self.upbit_url, "/v1/order")
 
-        response = await self.request("GET", url, params=params, headers=headers)
-        return Order.model_validate(response)
+        return await self.request(
+            "GET",
+            url,
+            group="default",
+            priority=Priority.POLL,
+            adapter=OrderAdapter,
+            params=params,
+            headers=headers,
+        )
 
-    @retry()
+    @metrics.timed("broker_call_seconds")
     async def get_orders(self, uuids: list[str]) -> dict[str, Order]:
+        orders = await asyncio.gather(
+            *(self.order_batcher.get(uuid) for uuid in uuids), return_exceptions=True
+        )
+        order_map = {}
+        for uuid, order in zip(uuids, orders):
+            if isinstance(order, Exception):
+                logger.warning(f"get_orders: {uuid} unavailable: {order}")
+            else:
+                order_map[uuid] = order
+        return order_map
+
+    async def fetch_orders(self, uuids: list[str]) -> dict[str, Order]:
         params = {"uuids[]": uuids}
         headers = {"Authorization": self.generate_authorization(params=params)}
         url = urljoin(self.upbit_url, "/v1/orders/uuids")
 
-        response = await self.request("GET", url, params=params, headers=headers)
-        orders = [Order.model_validate(item) for item in response]
-        order_map = {order.uuid: order for order in orders}
-
-        for uuid in uuids:
-            if uuid not in order_map:
-                raise ValueError(f"Missing order data for UUID: {uuid}\n{order_map}")
-        return order_map
+        orders = await self.request(
+            "GET",
+            url,
+            group="default",
+            priority=Priority.POLL,
+            adapter=OrderList,
+            params=params,
+            headers=headers,
+        )
+        return {order.uuid: order for order in orders}
 
-    @retry()
     async def buy_limit_order(self, ticker: str, price: float, volume: float) -> Order:
         return await self.place_order(
             ticker, "bid", "limit", price=price, volume=volume
         )
 
-    @retry()
     async def sell_limit_order(self, ticker: str, price: float, volume: float) -> Order:
         return await self.place_order(
             ticker, "ask", "limit", price=price, volume=volume
         )
 
-    @retry()
     async def buy_market_order(self, ticker: str, price: float) -> Order:
         return await self.place_order(ticker, "bid", "price", price=price)
 
-    @retry()
     async def sell_market_order(self, ticker: str, volume: float) -> Order:
         return await self.place_order(ticker, "ask", "market", volume=volume)
 
-    @retry()
+    @metrics.timed("broker_call_seconds")
     async def place_order(
         self,
         ticker: str,
@@ -112,39 +250,83 @@ class Broker:
         headers = {"Authorization": self.generate_authorization(params=params)}
         url = urljoin(self.upbit_url, "/v1/orders")
 
-        response = await self.request("POST", url, json=params, headers=headers)
-        return Order.model_validate(response)
+        order = await self.request(
+            "POST",
+            url,
+            group="order",
+            priority=Priority.ORDER,
+            adapter=OrderAdapter,
+            json=params,
+            headers=headers,
+        )
+        self.invalidate_balances()
+        return order
 
-    @retry()
+    @metrics.timed("broker_call_seconds")
     async def cancel_order(self, uuid: str) -> None:
         params = {"uuid": uuid}
         headers = {"Authorization": self.generate_authorization(params=params)}
         url = urljoin(self.upbit_url, "/v1/order")
-        return await self.request("DELETE", url, params=params, headers=headers)
-
-    @retry()
+        try:
+            return await self.request(
+                "DELETE",
+                url,
+                group="default",
+                priority=Priority.ORDER,
+                params=params,
+                headers=headers,
+            )
+        except APIError as e:
+            if e.status == 429 or e.status >= 500:
+                raise
+            logger.warning(f"cancel_order({uuid!r}) rejected: {e}")
+        finally:
+            self.invalidate_balances()
+
+    @metrics.timed("broker_call_seconds")
     async def cancel_orders(self, ticker: str) -> None:
         params = {"pairs": ticker}
         headers = {"Authorization": self.generate_authorization(params=params)}
         url = urljoin(self.upbit_url, "/v1/orders/open")
-        return await self.request("DELETE", url, params=params, headers=headers)
-
-    @retry()
+        try:
+            return await self.request(
+                "DELETE",
+                url,
+                group="order-cancel-all",
+                priority=Priority.ORDER,
+                params=params,
+                headers=headers,
+            )
+        except APIError as e:
+            if e.status == 429 or e.status >= 500:
+                raise
+            logger.warning(f"cancel_orders({ticker!r}) rejected: {e}")
+        finally:
+            self.invalidate_balances()
+
+    @metrics.timed("broker_call_seconds")
     async def get_fgi(self, currency: str) -> FGI:
-        pair = f"{currency}/KRW"
-        url = urljoin(self.datalab_url, "api/v1/indicator/fear/assets")
+        fgi_map = await self.cache.get("fgi", self.fetch_fgi, self.FGI_TTL)
 
-        response = await self.request("GET", url, params={"locale": "ko"})
-        records = response["data"]["records"]
+        pair = f"{currency}/KRW"
+        if pair not in fgi_map:
+            raise ValueError(f"FGI data for currency {currency} not found")
+        return fgi_map[pair]
 
-        for record in records:
-            record = FGIResponse.model_validate(record)
-            if record.pair == pair:
-                return FGI.from_response(record)
+    @retry()
+    async def fetch_fgi(self) -> dict[str, FGI]:
+        url = urljoin(self.datalab_url, "api/v1/indicator/fear/assets")
 
-        raise ValueError(f"FGI data for currency {currency} not found")
+        payload = await self.request(
+            "GET", url, adapter=FGIAdapter, params={"locale": "ko"}
+        )
+        return {
+            record.pair: FGI.from_response(record) for record in payload.data.records
+        }
 
     async def close(self):
+        await self.ticker_stream.close()
+        await self.order_stream.close()
         await self.session.close()
 
     @staticmethod
@@ -155,9 +337,5 @@ class Broker:
         return m.hexdigest()
 
     def generate_authorization(self, params: dict | None = None):
-        payload = {"access_key": self.ACCESS, "nonce": str(uuid_lib.uuid4())}
-        if params:
-            payload["query_hash"] = self.params_to_query_hash(params)
-            payload["query_hash_alg"] = "SHA512"
-
-        return f"Bearer {jwt.encode(payload, self.SECRET)}"
+        query_hash = self.params_to_query_hash(params) if params else None
+        return f"Bearer {self.signer.sign(query_hash)}"
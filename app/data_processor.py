@@ -1,34 +1,45 @@
 import asyncio
+import math
+import threading
 from io import BytesIO
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 import numpy as np
-from scipy.integrate import quad
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
 
 from .models import History
 from .schemas import Status, Dashboard
-from .utils import calc_ratio
-from config import ConfigKeys, config, Env
-
-matplotlib.use("Agg")
+from .utils import TTLCache, log_balance_change, lttb, sliding_extrema
+from config import config
 
 if TYPE_CHECKING:
+    import pandas as pd
     from app.broker import Broker
     from app.tracker import Tracker
 
 
 class DataProcessor:
-    def __init__(self, broker: "Broker", tracker: "Tracker") -> None:
+    DASHBOARD_TTL = 60.0
+    PRICE_BUCKET = 0.001
+    RENDER_LOCK = threading.Lock()
+
+    def __init__(
+        self,
+        broker: "Broker",
+        tracker: "Tracker",
+        cash_share: float = 1.0,
+        sampling: Literal["extrema", "lttb"] = "extrema",
+        n_points: int = 480,
+    ) -> None:
         self.broker = broker
         self.tracker = tracker
-        self.TICKER = Env.TICKER
-        self.CURRENCY = Env.CURRENCY
+        self.cash_share = cash_share
+        self.sampling = sampling
+        self.n_points = n_points
+        self.cache = TTLCache()
 
-    async def construct_status(self, histories: pd.DataFrame) -> Status:
+    async def construct_status(self, ticker: str, histories: "pd.DataFrame") -> Status:
+        quote, currency = ticker.split("-")
         history_3m = histories.iloc[0]
 
         time_7d = datetime.now() - timedelta(days=7)
@@ -41,24 +52,30 @@ class DataProcessor:
 
         balance_map, current_price, fgi = await asyncio.gather(
             self.broker.get_balances(),
-            self.broker.get_current_price(self.TICKER),
-            self.broker.get_fgi(self.CURRENCY),
+            self.broker.get_current_price(ticker),
+            self.broker.get_fgi(currency),
         )
 
-        cash_b = balance_map.get("KRW")
-        cash = 0 if not cash_b else cash_b.balance + cash_b.locked
-        coin_b = balance_map.get(self.CURRENCY)
+        ledger = config.get_ledger(ticker) if self.cash_share < 1 else None
+        if ledger is None:
+            cash_b = balance_map.get(quote)
+            cash = 0 if not cash_b else cash_b.balance + cash_b.locked
+            cash *= self.cash_share
+        else:
+            cash, _ = ledger
+        coin_b = balance_map.get(currency)
         quantity = 0 if not coin_b else coin_b.balance + coin_b.locked
         current_balance = cash + quantity * current_price
+        pivot_price = config.get_pivot(ticker)
 
         estimated_balance_3m = self.estimate_balance_at_price(
-            current_balance, current_price, history_3m[History.price.name]
+            current_balance, current_price, history_3m[History.price.name], pivot_price
         )
         profit_3m, profit_rate_3m = self.calc_delta_rate(
             estimated_balance_3m, history_3m[History.balance.name]
         )
         estimated_balance_7d = self.estimate_balance_at_price(
-            current_balance, current_price, history_7d[History.price.name]
+            current_balance, current_price, history_7d[History.price.name], pivot_price
         )
         profit_7d, profit_rate_7d = self.calc_delta_rate(
             estimated_balance_7d, history_7d[History.balance.name]
@@ -78,6 +95,7 @@ class DataProcessor:
         )
 
         return Status(
+            ticker=ticker,
             profit_3m=profit_3m,
             profit_rate_3m=profit_rate_3m,
             profit_7d=profit_7d,
@@ -97,6 +115,21 @@ class DataProcessor:
             fgi_text=fgi.state,
         )
 
+    @staticmethod
+    def load_pyplot():
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        return plt
+
+    @staticmethod
+    def warm_up() -> None:
+        import pandas  # noqa: F401
+
+        DataProcessor.load_pyplot()
+
     @staticmethod
     def calc_delta_rate(pivot: float, comp: float) -> tuple[float, float]:
         delta = pivot - comp
@@ -105,50 +138,83 @@ class DataProcessor:
 
     @staticmethod
     def estimate_balance_at_price(
-        balance: float, cur_price: float, target_price: float
-    ) -> float:
-        pivot_price = config.get(ConfigKeys.PIVOT)
-
-        def integrand(price: float):
-            ratio = calc_ratio(price, pivot_price)
-            return (1 - ratio) / price
-
-        integral, _ = quad(integrand, cur_price, target_price)
+        balance: float,
+        cur_price: float,
+        target_price: float | np.ndarray,
+        pivot_price: float,
+    ) -> float | np.ndarray:
+        integral = log_balance_change(cur_price, target_price, pivot_price)
         return balance * np.exp(integral)
 
-    async def process(self) -> Dashboard:
-        histories = await self.tracker.get_recent_histories()
-        status = await self.construct_status(histories)
+    async def process(self, ticker: str) -> Dashboard:
+        price = await self.broker.get_current_price(ticker)
+        bucket = round(math.log(price) / math.log1p(self.PRICE_BUCKET))
+        key = (ticker, self.tracker.last_ids[ticker], bucket)
 
-        histories = self.adaptive_sampling(histories)
-        trend_plot = self.generate_trend_plot(histories)
+        self.cache.prune()
+        dashboard = await self.cache.get(
+            key, lambda: self.build_dashboard(ticker), self.DASHBOARD_TTL
+        )
+        return Dashboard(
+            trend=BytesIO(dashboard.trend.getvalue()), status=dashboard.status
+        )
 
+    async def build_dashboard(self, ticker: str) -> Dashboard:
+        histories = await self.tracker.get_recent_histories(ticker)
+        status = await self.construct_status(ticker, histories)
+
+        trend = await self.trend_histories(ticker, histories)
+        trend_plot = await asyncio.to_thread(self.render_trend, trend)
         return Dashboard(trend=trend_plot, status=status)
 
-    def adaptive_sampling(self, histories: pd.DataFrame) -> pd.DataFrame:
+    async def trend_histories(
+        self, ticker: str, histories: "pd.DataFrame"
+    ) -> "pd.DataFrame":
+        import pandas as pd
+
+        start = histories[History.timestamp.name].iloc[0].to_pydatetime()
+        rollups = await self.tracker.get_rollups(
+            ticker, start, max_points=self.n_points
+        )
+        if rollups.empty:
+            return histories
+
+        return pd.DataFrame(
+            {
+                History.timestamp.name: pd.to_datetime(rollups["bucket"]),
+                History.balance.name: rollups["balance_close"],
+                History.price.name: rollups["price_close"],
+                History.ratio.name: rollups["ratio"],
+            }
+        )
+
+    def render_trend(self, histories: "pd.DataFrame") -> BytesIO:
+        if len(histories) > self.n_points:
+            histories = self.sample(histories)
+        with self.RENDER_LOCK:
+            return self.generate_trend_plot(histories)
+
+    def sample(self, histories: "pd.DataFrame") -> "pd.DataFrame":
+        if self.sampling == "lttb":
+            return self.lttb_sampling(histories)
+        return self.adaptive_sampling(histories)
+
+    def adaptive_sampling(self, histories: "pd.DataFrame") -> "pd.DataFrame":
         time_diff: timedelta = (
             histories[History.timestamp.name].iloc[-1]
             - histories[History.timestamp.name].iloc[0]
         )
         unit = time_diff.total_seconds() * 1e9 / 240
         ts = histories[History.timestamp.name].astype("int64").to_numpy()
+        prices = histories[History.price.name].to_numpy()
 
-        min_vals = np.empty(len(histories))
-        max_vals = np.empty(len(histories))
-
-        start_idx = 0
-        end_idx = 0
-        for i in range(len(histories)):
-            while ts[i] - ts[start_idx] > unit:
-                start_idx += 1
-            while end_idx < len(histories) and ts[end_idx] - ts[i] < unit:
-                end_idx += 1
-
-            window = histories[History.price.name].iloc[start_idx:end_idx]
-            min_vals[i] = window.min()
-            max_vals[i] = window.max()
+        starts = np.searchsorted(ts, ts - math.floor(unit), side="left")
+        ends = np.maximum(
+            np.searchsorted(ts, ts + math.ceil(unit), side="left"),
+            np.arange(1, len(ts) + 1),
+        )
+        min_vals, max_vals = sliding_extrema(prices, starts, ends)
 
-        prices = histories[History.price.name].to_numpy()
         is_extreme = (prices == min_vals) | (prices == max_vals)
         gap_mask = np.diff(ts, prepend=ts[0]) > unit
 
@@ -157,7 +223,15 @@ class DataProcessor:
             np.unique(np.concatenate([selected, [0, len(histories) - 1]]))
         ]
 
-    def generate_trend_plot(self, histories: pd.DataFrame) -> BytesIO:
+    def lttb_sampling(self, histories: "pd.DataFrame") -> "pd.DataFrame":
+        ts = histories[History.timestamp.name].astype("int64").to_numpy()
+        prices = histories[History.price.name].to_numpy()
+        return histories.iloc[lttb(ts, prices, self.n_points)]
+
+    @staticmethod
+    def generate_trend_plot(histories: "pd.DataFrame") -> BytesIO:
+        plt = DataProcessor.load_pyplot()
+
         initial_balance = histories[History.balance.name].iloc[0]
         value_rate = (histories[History.balance.name] / initial_balance - 1) * 100
         initial_price = histories[History.price.name].iloc[0]
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+class HistoryBuffer:
+    def __init__(
+        self, retention: timedelta = timedelta(days=90), capacity: int = 1024
+    ) -> None:
+        self.retention = retention
+        self.start = 0
+        self.end = 0
+        self.allocate(capacity)
+
+    def allocate(self, capacity: int) -> None:
+        live = slice(self.start, self.end)
+        timestamps = np.empty(capacity, dtype="datetime64[ns]")
+        balances = np.empty(capacity)
+        prices = np.empty(capacity)
+        ratios = np.empty(capacity)
+
+        size = self.end - self.start
+        if size:
+            timestamps[:size] = self.timestamps[live]
+            balances[:size] = self.balances[live]
+            prices[:size] = self.prices[live]
+            ratios[:size] = self.ratios[live]
+
+        self.timestamps, self.balances, self.prices, self.ratios = (
+            timestamps,
+            balances,
+            prices,
+            ratios,
+        )
+        self.start, self.end = 0, size
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def reserve(self, n: int) -> None:
+        capacity = len(self.timestamps)
+        if self.end + n <= capacity:
+            return
+
+        required = len(self) + n
+        if required > capacity // 2:
+            capacity = max(capacity * 2, required * 2)
+        self.allocate(capacity)
+
+    def extend(
+        self,
+        timestamps: np.ndarray,
+        balances: np.ndarray,
+        prices: np.ndarray,
+        ratios: np.ndarray,
+    ) -> None:
+        n = len(timestamps)
+        self.reserve(n)
+        new = slice(self.end, self.end + n)
+        self.timestamps[new] = timestamps
+        self.balances[new] = balances
+        self.prices[new] = prices
+        self.ratios[new] = ratios
+        self.end += n
+
+    def append(
+        self, timestamp: datetime, balance: float, price: float, ratio: float
+    ) -> None:
+        self.reserve(1)
+        self.timestamps[self.end] = np.datetime64(timestamp, "ns")
+        self.balances[self.end] = balance
+        self.prices[self.end] = price
+        self.ratios[self.end] = ratio
+        self.end += 1
+
+    def trim(self, now: datetime) -> None:
+        cutoff = np.datetime64(now - self.retention, "ns")
+        live = self.timestamps[self.start : self.end]
+        self.start += int(np.searchsorted(live, cutoff, side="left"))
+
+    def columns(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        live = slice(self.start, self.end)
+        return (
+            self.timestamps[live],
+            self.balances[live],
+            self.prices[live],
+            self.ratios[live],
+        )
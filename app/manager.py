@@ -1,20 +1,39 @@
 import asyncio
+import logging
 import signal
+from datetime import timedelta
 
 from .telegram_bot import TelegramBot
 from .trading_bot import TradingBot
 from .data_processor import DataProcessor
 from .tracker import Tracker
 from .broker import Broker
+from .metrics_server import MetricsServer
+from .archive import HistoryArchive, archive_histories
+from .utils import metrics
+from config import Env, config
+
+logger = logging.getLogger(__name__)
 
 
 class Manager:
+    ARCHIVE_INTERVAL = 24 * 60 * 60
+
     def __init__(self) -> None:
         self.broker = Broker()
         self.tracker = Tracker()
-        self.trading_bot = TradingBot(self.broker, self.tracker)
-        self.data_processor = DataProcessor(self.broker, self.tracker)
-        self.telegram_bot = TelegramBot(self.trading_bot, self.data_processor)
+        cash_share = 1 / len(Env.TICKERS)
+        self.trading_bots = [
+            TradingBot(self.broker, self.tracker, ticker, cash_share)
+            for ticker in Env.TICKERS
+        ]
+        self.data_processor = DataProcessor(
+            self.broker, self.tracker, cash_share=cash_share, sampling=Env.SAMPLING
+        )
+        self.telegram_bot = TelegramBot(self.trading_bots, self.data_processor)
+        self.metrics_server = MetricsServer(metrics, Env.METRICS_HOST, Env.METRICS_PORT)
+        self.archive = HistoryArchive()
+        self.archiver: asyncio.Task | None = None
 
     async def run(self) -> None:
         stop_event = asyncio.Event()
@@ -28,10 +47,35 @@ class Manager:
 
         try:
             self.broker.initialize()
+            await self.metrics_server.start()
+            await self.tracker.initialize()
             await self.telegram_bot.start()
+            self.warm_up = asyncio.create_task(
+                asyncio.to_thread(DataProcessor.warm_up)
+            )
+            self.archiver = asyncio.create_task(self.archive_periodically())
 
             await stop_event.wait()
 
         finally:
+            if self.archiver is not None:
+                self.archiver.cancel()
+                try:
+                    await self.archiver
+                except asyncio.CancelledError:
+                    pass
+                self.archiver = None
             await self.telegram_bot.stop()
+            await self.tracker.close()
+            await config.flush()
             await self.broker.close()
+            await self.metrics_server.stop()
+
+    async def archive_periodically(self) -> None:
+        horizon = max(timedelta(days=Env.ARCHIVE_DAYS), self.tracker.retention)
+        while True:
+            try:
+                await archive_histories(self.archive, horizon)
+            except Exception as e:
+                logger.error(f"failed to archive histories: {e}")
+            await asyncio.sleep(self.ARCHIVE_INTERVAL)
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+
+from aiohttp import web
+
+from .utils import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsServer:
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(
+        self, metrics: Metrics, host: str, port: int, lag_interval: float = 0.5
+    ) -> None:
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.lag_interval = lag_interval
+        self.runner: web.AppRunner | None = None
+        self.lag_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self.lag_task = asyncio.create_task(self.monitor_lag())
+        if not self.port:
+            return
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"metrics at http://{self.host}:{self.port}/metrics")
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.metrics.render(), headers={"Content-Type": self.CONTENT_TYPE}
+        )
+
+    async def monitor_lag(self) -> None:
+        lag = self.metrics.histogram("event_loop_lag_seconds")
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag.record(max(loop.time() - start - self.lag_interval, 0.0))
+
+    async def stop(self) -> None:
+        if self.lag_task is not None:
+            self.lag_task.cancel()
+            try:
+                await self.lag_task
+            except asyncio.CancelledError:
+                pass
+            self.lag_task = None
+
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
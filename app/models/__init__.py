@@ -1,4 +1,14 @@
 from .history import History
+from .rollup import Rollup, MinuteRollup, HourRollup, DayRollup, ROLLUPS
 from .database import SessionLocal, init_db
 
-__all__ = ["History", "SessionLocal", "init_db"]
+__all__ = [
+    "History",
+    "Rollup",
+    "MinuteRollup",
+    "HourRollup",
+    "DayRollup",
+    "ROLLUPS",
+    "SessionLocal",
+    "init_db",
+]
@@ -1,19 +1,48 @@
 import os
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
 
 from .base import Base
 from config import Env
 
-data_dir = Env.DATA_DIR
-os.makedirs(data_dir, exist_ok=True)
-database_path = os.path.join(data_dir, "app.db")
-DATABASE_URL = f"sqlite+aiosqlite:///{database_path}"
+engine: AsyncEngine | None = None
+SessionLocal = async_sessionmaker(class_=AsyncSession)
 
-engine = create_async_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = async_sessionmaker(engine, class_=AsyncSession)
 
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
-async def init_db():
-    async with engine.begin() as conn:
+
+def init_engine(data_dir: str | None = None) -> AsyncEngine:
+    global engine
+    if engine is not None:
+        return engine
+
+    data_dir = data_dir or Env.DATA_DIR
+    os.makedirs(data_dir, exist_ok=True)
+    database_path = os.path.join(data_dir, "app.db")
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}",
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+async def init_db(data_dir: str | None = None):
+    async with init_engine(data_dir).begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
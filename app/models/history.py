@@ -1,11 +1,13 @@
-from sqlalchemy import Column, Integer, Float, DateTime
+from sqlalchemy import Column, Integer, Float, DateTime, String
 from .base import Base
 
 
 class History(Base):
     __tablename__ = "histories"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True)
+    market = Column(String, index=True)
     timestamp = Column(DateTime, index=True)
     balance = Column(Float)
     price = Column(Float)
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from sqlalchemy import Column, Integer, Float, DateTime, String
+from .base import Base
+
+
+class Rollup:
+    market = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    price_open = Column(Float)
+    price_high = Column(Float)
+    price_low = Column(Float)
+    price_close = Column(Float)
+    balance_open = Column(Float)
+    balance_high = Column(Float)
+    balance_low = Column(Float)
+    balance_close = Column(Float)
+    ratio = Column(Float)
+    trades = Column(Integer)
+
+
+class MinuteRollup(Rollup, Base):
+    __tablename__ = "histories_1m"
+    resolution = timedelta(minutes=1)
+
+
+class HourRollup(Rollup, Base):
+    __tablename__ = "histories_1h"
+    resolution = timedelta(hours=1)
+
+
+class DayRollup(Rollup, Base):
+    __tablename__ = "histories_1d"
+    resolution = timedelta(days=1)
+
+
+ROLLUPS: tuple[type[Rollup], ...] = (MinuteRollup, HourRollup, DayRollup)
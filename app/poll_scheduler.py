@@ -0,0 +1,80 @@
+import math
+import time
+from collections import deque
+from itertools import pairwise
+
+from .utils import TickTable
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        table: TickTable,
+        min_interval: float = 0.25,
+        max_interval: float = 8.0,
+        backoff: float = 2.0,
+        near_ticks: int = 2,
+        z_score: float = 2.0,
+        window: int = 120,
+    ) -> None:
+        self.table = table
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.near_ticks = near_ticks
+        self.z_score = z_score
+        self.samples: deque[tuple[float, float]] = deque(maxlen=window)
+        self.limit = max_interval
+        self.reset()
+
+    def reset(self) -> None:
+        self.interval = self.min_interval
+        self.last_poll = time.monotonic()
+
+    def observe(self, price: float, now: float) -> None:
+        self.samples.append((now, math.log(price)))
+
+    def volatility(self) -> float:
+        if len(self.samples) < 2:
+            return 0.0
+
+        elapsed = self.samples[-1][0] - self.samples[0][0]
+        if elapsed <= 0:
+            return 0.0
+        variance = sum((b - a) ** 2 for (_, a), (_, b) in pairwise(self.samples))
+        return math.sqrt(variance / elapsed)
+
+    def safe_interval(
+        self, price: float, lower_price: float, upper_price: float
+    ) -> float:
+        if price <= lower_price or price >= upper_price:
+            return 0.0
+
+        index = self.table.index(price)
+        ticks = min(
+            index - self.table.index(lower_price),
+            self.table.index(upper_price) - index,
+        )
+        if ticks <= self.near_ticks:
+            return 0.0
+
+        volatility = self.volatility()
+        if volatility == 0:
+            return self.max_interval
+        distance = min(math.log(price / lower_price), math.log(upper_price / price))
+        return (distance / (self.z_score * volatility)) ** 2
+
+    def schedule(self, price: float, lower_price: float, upper_price: float) -> float:
+        now = time.monotonic()
+        self.observe(price, now)
+        self.limit = min(
+            max(self.safe_interval(price, lower_price, upper_price), self.min_interval),
+            self.max_interval,
+        )
+        interval = min(self.interval, self.limit)
+        return max(self.last_poll + interval - now, 0.0)
+
+    def polled(self) -> float:
+        self.last_poll = time.monotonic()
+        self.interval = min(self.interval * self.backoff, self.limit)
+        return self.interval
@@ -0,0 +1,122 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    ORDER = 0
+    POLL = 1
+    READ = 2
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.period = self.capacity / rate
+        self.grants: deque[float] = deque(maxlen=int(self.capacity))
+
+        self.waiters: list[tuple[int, int, asyncio.Future[float]]] = []
+        self.counter = itertools.count()
+        self.wakeup: asyncio.TimerHandle | None = None
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        self.refill()
+        delay = max((1 - self.tokens) / self.rate, 0)
+        if len(self.grants) == self.grants.maxlen:
+            delay = max(delay, self.grants[0] + self.period - self.updated)
+        return delay
+
+    def take(self) -> float:
+        self.tokens -= 1
+        self.grants.append(self.updated)
+        return self.updated
+
+    async def acquire(self, priority: int = Priority.READ) -> None:
+        if not self.waiters and self.delay() == 0:
+            self.take()
+            return
+
+        future: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), future))
+        self.schedule()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.tokens += 1
+                granted_at = future.result()
+                if granted_at in self.grants:
+                    self.grants.remove(granted_at)
+                self.dispatch()
+            raise
+
+    def dispatch(self) -> None:
+        self.wakeup = None
+
+        while self.waiters and self.delay() == 0:
+            _, _, future = heapq.heappop(self.waiters)
+            if future.done():
+                continue
+            future.set_result(self.take())
+
+        self.schedule()
+
+    def schedule(self) -> None:
+        if self.wakeup is not None or not self.waiters:
+            return
+
+        self.wakeup = asyncio.get_running_loop().call_later(
+            self.delay(), self.dispatch
+        )
+
+    def calibrate(self, remaining: float) -> None:
+        self.refill()
+        self.tokens = min(self.tokens, remaining)
+
+
+class RateLimiter:
+    GROUP_RATES = {
+        "order": 8.0,
+        "order-cancel-all": 0.5,
+        "default": 30.0,
+        "quotation": 10.0,
+    }
+
+    def __init__(self, rates: dict[str, float] | None = None) -> None:
+        rates = rates if rates is not None else self.GROUP_RATES
+        self.buckets = {group: TokenBucket(rate) for group, rate in rates.items()}
+
+    async def acquire(self, group: str, priority: int = Priority.READ) -> None:
+        await self.buckets[group].acquire(priority)
+
+    def throttle(self, group: str) -> None:
+        self.buckets[group].calibrate(0)
+
+    def update(self, remaining_req: str | None, status: int) -> None:
+        if remaining_req is None:
+            return
+
+        fields = dict(
+            field.strip().split("=", 1)
+            for field in remaining_req.split(";")
+            if "=" in field
+        )
+        group = fields.get("group", "quotation")
+        bucket = self.buckets.get(group, self.buckets["quotation"])
+
+        if status == 429:
+            bucket.calibrate(0)
+        elif "sec" in fields:
+            bucket.calibrate(int(fields["sec"]))
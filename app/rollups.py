@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from functools import cache
+from typing import Iterator
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import Insert, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .archive import HistoryArchive
+from .models import ROLLUPS, History, Rollup, SessionLocal, init_db
+from config import Env
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def floor_time(timestamp: datetime, resolution: timedelta) -> datetime:
+    return EPOCH + (timestamp - EPOCH) // resolution * resolution
+
+
+def aggregate(rows: list[dict], resolution: timedelta) -> list[dict]:
+    bars: dict[tuple[str, datetime], dict] = {}
+    for row in rows:
+        market = row[History.market.name]
+        bucket = floor_time(row[History.timestamp.name], resolution)
+        price = row[History.price.name]
+        balance = row[History.balance.name]
+
+        bar = bars.get((market, bucket))
+        if bar is None:
+            bars[market, bucket] = {
+                "market": market,
+                "bucket": bucket,
+                "price_open": price,
+                "price_high": price,
+                "price_low": price,
+                "price_close": price,
+                "balance_open": balance,
+                "balance_high": balance,
+                "balance_low": balance,
+                "balance_close": balance,
+                "ratio": row[History.ratio.name],
+                "trades": 1,
+            }
+            continue
+
+        bar["price_high"] = max(bar["price_high"], price)
+        bar["price_low"] = min(bar["price_low"], price)
+        bar["price_close"] = price
+        bar["balance_high"] = max(bar["balance_high"], balance)
+        bar["balance_low"] = min(bar["balance_low"], balance)
+        bar["balance_close"] = balance
+        bar["ratio"] = row[History.ratio.name]
+        bar["trades"] += 1
+    return list(bars.values())
+
+
+@cache
+def upsert_statement(model: type[Rollup]) -> Insert:
+    stmt = insert(model)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[model.market, model.bucket],
+        set_={
+            "price_high": func.max(model.price_high, excluded.price_high),
+            "price_low": func.min(model.price_low, excluded.price_low),
+            "price_close": excluded.price_close,
+            "balance_high": func.max(model.balance_high, excluded.balance_high),
+            "balance_low": func.min(model.balance_low, excluded.balance_low),
+            "balance_close": excluded.balance_close,
+            "ratio": excluded.ratio,
+            "trades": model.trades + excluded.trades,
+        },
+    )
+
+
+async def upsert_rollups(session: AsyncSession, rows: list[dict]) -> None:
+    rows = [row for row in rows if row[History.market.name] is not None]
+    if not rows:
+        return
+
+    for model in ROLLUPS:
+        bars = aggregate(rows, model.resolution)
+        await session.execute(upsert_statement(model), bars)
+
+
+async def select_rollup(
+    session: AsyncSession,
+    market: str,
+    start: datetime,
+    end: datetime,
+    max_points: int,
+) -> type[Rollup]:
+    for model in ROLLUPS:
+        if (end - start) / model.resolution <= max_points:
+            return model
+
+        count = await session.scalar(
+            select(func.count())
+            .select_from(model)
+            .where(
+                model.market == market,
+                model.bucket >= floor_time(start, model.resolution),
+                model.bucket <= end,
+            )
+        )
+        if count <= max_points:
+            return model
+    return ROLLUPS[-1]
+
+
+async def query_rollups(
+    market: str,
+    start: datetime,
+    end: datetime | None = None,
+    max_points: int = 480,
+) -> tuple[type[Rollup], list[Row]]:
+    end = end or datetime.now()
+
+    async with SessionLocal() as session:
+        model = await select_rollup(session, market, start, end, max_points)
+        columns = [column for column in model.__table__.c if column.name != "market"]
+        query = (
+            select(*columns)
+            .where(
+                model.market == market,
+                model.bucket >= floor_time(start, model.resolution),
+                model.bucket <= end,
+            )
+            .order_by(model.bucket.asc())
+        )
+        result = await session.execute(query)
+        return model, list(result.all())
+
+
+def archived_rows(
+    archive: HistoryArchive, chunk_size: int = 10_000
+) -> Iterator[list[dict]]:
+    for market in archive.markets():
+        for segment in archive.segments(market):
+            timestamps = segment[History.timestamp.name].astype("datetime64[us]")
+            for i in range(0, len(timestamps), chunk_size):
+                columns = zip(
+                    timestamps[i : i + chunk_size].tolist(),
+                    segment[History.balance.name][i : i + chunk_size].tolist(),
+                    segment[History.price.name][i : i + chunk_size].tolist(),
+                    segment[History.ratio.name][i : i + chunk_size].tolist(),
+                )
+                yield [
+                    {
+                        History.market.name: market,
+                        History.timestamp.name: timestamp,
+                        History.balance.name: balance,
+                        History.price.name: price,
+                        History.ratio.name: ratio,
+                    }
+                    for timestamp, balance, price, ratio in columns
+                ]
+
+
+async def backfill(
+    archive: HistoryArchive | None = None, chunk_size: int = 10_000
+) -> int:
+    columns = (
+        History.id,
+        History.market,
+        History.timestamp,
+        History.balance,
+        History.price,
+        History.ratio,
+    )
+    n_rows, last_id = 0, 0
+
+    async with SessionLocal() as session:
+        for model in ROLLUPS:
+            await session.execute(delete(model))
+
+        if archive is not None:
+            for rows in archived_rows(archive, chunk_size):
+                await upsert_rollups(session, rows)
+                n_rows += len(rows)
+
+        while True:
+            result = await session.execute(
+                select(*columns)
+                .where(History.id > last_id, History.market.is_not(None))
+                .order_by(History.id.asc())
+                .limit(chunk_size)
+            )
+            rows = [row._asdict() for row in result.all()]
+            if not rows:
+                break
+
+            await upsert_rollups(session, rows)
+            n_rows += len(rows)
+            last_id = rows[-1][History.id.name]
+            logger.info(f"backfilled {n_rows} history rows")
+
+        await session.commit()
+    return n_rows
+
+
+async def main(data_dir: str | None) -> None:
+    await init_db(data_dir)
+    archive = HistoryArchive(os.path.join(data_dir or Env.DATA_DIR, "archive"))
+    n_rows = await backfill(archive)
+    print(f"Rebuilt {len(ROLLUPS)} rollup tables from {n_rows} history rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the history rollup tables")
+    parser.add_argument("--data-dir", default=None, help="directory holding app.db")
+    args = parser.parse_args()
+    asyncio.run(main(args.data_dir))
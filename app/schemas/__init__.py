@@ -1,3 +1,31 @@
-from .schemas import Status, Dashboard, Balance, Order, FGI
+from .schemas import (
+    Status,
+    Dashboard,
+    Balance,
+    Order,
+    Ticker,
+    FGI,
+    FGIResponse,
+    JSONAdapter,
+    TickerList,
+    BalanceList,
+    OrderAdapter,
+    OrderList,
+    FGIAdapter,
+)
 
-__all__ = ["Status", "Dashboard", "Balance", "Order", "FGI"]
+__all__ = [
+    "Status",
+    "Dashboard",
+    "Balance",
+    "Order",
+    "Ticker",
+    "FGI",
+    "FGIResponse",
+    "JSONAdapter",
+    "TickerList",
+    "BalanceList",
+    "OrderAdapter",
+    "OrderList",
+    "FGIAdapter",
+]
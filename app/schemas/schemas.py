@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
-from pydantic import BaseModel
-from typing import TYPE_CHECKING
+from pydantic import BaseModel, TypeAdapter
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from io import BytesIO
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 
 @dataclass
 class Status:
+    ticker: str
+
     profit_3m: float
     profit_rate_3m: float
     profit_7d: float
@@ -65,17 +67,34 @@ class Order(BaseModel):
     paid_fee: float
     locked: float
     executed_volume: float
+    executed_funds: float | None = None
     trades_count: int
 
     class Config:
         extra = "ignore"
 
 
+class Ticker(BaseModel):
+    market: str
+    trade_price: float
+
+    class Config:
+        extra = "ignore"
+
+
 class FGIResponse(BaseModel):
     pair: str
     tradePrice: float
 
 
+class FGIRecords(BaseModel):
+    records: list[FGIResponse]
+
+
+class FGIPayload(BaseModel):
+    data: FGIRecords
+
+
 @dataclass
 class FGI:
     score: float
@@ -100,3 +119,11 @@ class FGI:
                 break
 
         return cls(score=score, state=state)
+
+
+JSONAdapter: TypeAdapter[Any] = TypeAdapter(Any)
+TickerList = TypeAdapter(list[Ticker])
+BalanceList = TypeAdapter(list[Balance])
+OrderAdapter = TypeAdapter(Order)
+OrderList = TypeAdapter(list[Order])
+FGIAdapter = TypeAdapter(FGIPayload)
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+
+from .utils import TickTable, calc_ratio, gallop
+
+
+@dataclass(frozen=True)
+class GridStrategy:
+    profit_threshold: float = 0.005
+    min_order: float = 5000
+    ratio_exponent: float = 2
+    max_ratio: float = 0.875
+
+    def calc_ratio(self, price: float, pivot_price: float) -> float:
+        return calc_ratio(price, pivot_price, self.ratio_exponent, self.max_ratio)
+
+    def calc_volume(
+        self, price: float, cash: float, quantity: float, pivot_price: float
+    ) -> float:
+        ratio = self.calc_ratio(price, pivot_price)
+        value = quantity * price + cash
+        return cash - value * ratio
+
+    def is_trade_profitable(self, last_price: float, price: float) -> bool:
+        return abs(last_price - price) / last_price >= self.profit_threshold
+
+    def is_profitable_order(
+        self, last_price: float, price: float, volume: float
+    ) -> bool:
+        return self.is_trade_profitable(last_price, price) and volume >= self.min_order
+
+    def next_pivot(self, last_price: float, pivot_price: float) -> float:
+        if last_price >= pivot_price * 2:
+            return last_price / 2
+        return pivot_price
+
+    def optimal_price(
+        self,
+        table: TickTable,
+        cur_price: float,
+        cash: float,
+        quantity: float,
+        pivot_price: float,
+    ) -> float:
+        cur_index = table.index(cur_price)
+        gaps: dict[int, float] = {}
+
+        def gap(index: int) -> float:
+            if index not in gaps:
+                price = table.price(index)
+                gaps[index] = abs(self.calc_volume(price, cash, quantity, pivot_price))
+            return gaps[index]
+
+        min_volume = gap(cur_index)
+        optimal_index = cur_index
+
+        for direction in (-1, 1):
+            if cur_index + direction <= 0 or gap(cur_index + direction) >= min_volume:
+                continue
+
+            def stops(n: int) -> bool:
+                index = cur_index + n * direction
+                return index <= 0 or gap(index) >= gap(index - direction)
+
+            n = gallop(stops, start=2)
+            optimal_index = cur_index + (n - 1) * direction
+            min_volume = gap(optimal_index)
+
+        if optimal_index == cur_index:
+            return cur_price
+        return table.price(optimal_index)
+
+    def order_prices(
+        self,
+        table: TickTable,
+        last_price: float,
+        cash: float,
+        quantity: float,
+        pivot_price: float,
+    ) -> tuple[float | None, float | None]:
+        last_index = table.index(last_price)
+
+        def can_buy(n: int) -> bool:
+            price = table.price(last_index - n)
+            volume = self.calc_volume(price, cash, quantity, pivot_price)
+            return self.is_profitable_order(last_price, price, volume)
+
+        def can_sell(n: int) -> bool:
+            price = table.price(last_index + n)
+            volume = -self.calc_volume(price, cash, quantity, pivot_price)
+            return self.is_profitable_order(last_price, price, volume)
+
+        n_lower = gallop(can_buy, limit=last_index - 1)
+        n_upper = gallop(can_sell)
+        return (
+            None if n_lower is None else table.price(last_index - n_lower),
+            None if n_upper is None else table.price(last_index + n_upper),
+        )
@@ -0,0 +1,4 @@
+from .ticker import TickerStream
+from .order import OrderStream, CLOSED_STATES
+
+__all__ = ["TickerStream", "OrderStream", "CLOSED_STATES"]
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import logging
+from typing import Any
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class WebSocketStream:
+    def __init__(
+        self,
+        url: str,
+        heartbeat: float = 30.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        self.url = url
+        self.heartbeat = heartbeat
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.ws: aiohttp.ClientWebSocketResponse | None = None
+        self.task: asyncio.Task | None = None
+
+    def start(self, session: aiohttp.ClientSession) -> None:
+        if self.task is None:
+            self.session = session
+            self.task = asyncio.create_task(self.run())
+
+    def is_connected(self) -> bool:
+        return self.ws is not None and not self.ws.closed
+
+    async def run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with self.session.ws_connect(
+                    self.url, headers=self.headers(), heartbeat=self.heartbeat
+                ) as ws:
+                    self.ws = ws
+                    delay = self.reconnect_delay
+                    await self.on_connect()
+
+                    async for msg in ws:
+                        if msg.type in (aiohttp.WSMsgType.BINARY, aiohttp.WSMsgType.TEXT):
+                            self.on_message(json.loads(msg.data))
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{type(self).__name__} disconnected: {e}")
+            finally:
+                self.ws = None
+                self.on_disconnect()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def send(self, message: Any) -> None:
+        if self.ws is not None and not self.ws.closed:
+            await self.ws.send_json(message)
+
+    def headers(self) -> dict[str, str]:
+        return {}
+
+    async def on_connect(self) -> None: ...
+
+    def on_message(self, message: dict) -> None: ...
+
+    def on_disconnect(self) -> None: ...
+
+    async def close(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
@@ -0,0 +1,93 @@
+import asyncio
+import time
+import uuid as uuid_lib
+from collections import OrderedDict
+from typing import Callable
+
+from .base import WebSocketStream
+from ..utils import metrics
+
+CLOSED_STATES = ("done", "cancel")
+
+
+class OrderStream(WebSocketStream):
+    def __init__(
+        self,
+        url: str,
+        authorize: Callable[[], str],
+        on_closed: Callable[[str, str], None] | None = None,
+        on_trade: Callable[[str], None] | None = None,
+        history_size: int = 1024,
+        **kwargs,
+    ) -> None:
+        super().__init__(url, **kwargs)
+        self.authorize = authorize
+        self.on_closed = on_closed
+        self.on_trade = on_trade
+        self.history_size = history_size
+        self.waiters: dict[str, asyncio.Future[str]] = {}
+        self.references: dict[str, int] = {}
+        self.closed: OrderedDict[str, str] = OrderedDict()
+        self.detection = metrics.histogram("fill_detection_seconds", source="stream")
+
+    def wait_closed(self, uuid: str) -> asyncio.Future[str]:
+        future = self.waiters.get(uuid)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            if uuid in self.closed:
+                future.set_result(self.closed[uuid])
+                return future
+            self.waiters[uuid] = future
+        self.references[uuid] = self.references.get(uuid, 0) + 1
+        return future
+
+    def discard(self, uuid: str) -> None:
+        references = self.references.get(uuid, 0) - 1
+        if references > 0:
+            self.references[uuid] = references
+            return
+
+        self.references.pop(uuid, None)
+        future = self.waiters.pop(uuid, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def resolve(self, uuid: str, state: str) -> None:
+        if state not in CLOSED_STATES or uuid in self.closed:
+            return
+
+        if self.on_closed is not None:
+            self.on_closed(uuid, state)
+        self.closed[uuid] = state
+        self.closed.move_to_end(uuid)
+        while len(self.closed) > self.history_size:
+            self.closed.popitem(last=False)
+
+        self.references.pop(uuid, None)
+        future = self.waiters.pop(uuid, None)
+        if future is not None and not future.done():
+            future.set_result(state)
+
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": self.authorize()}
+
+    async def on_connect(self) -> None:
+        await self.send(
+            [
+                {"ticket": str(uuid_lib.uuid4())},
+                {"type": "myOrder"},
+                {"format": "DEFAULT"},
+            ]
+        )
+
+    def on_message(self, message: dict) -> None:
+        if message.get("type") != "myOrder":
+            return
+
+        if message["state"] == "trade" and self.on_trade is not None:
+            self.on_trade(message["uuid"])
+
+        trade_timestamp = message.get("trade_timestamp")
+        if message["state"] == "done" and trade_timestamp:
+            self.detection.record(max(time.time() - trade_timestamp / 1000, 0.0))
+        self.resolve(message["uuid"], message["state"])
@@ -0,0 +1,46 @@
+import time
+import uuid as uuid_lib
+
+from .base import WebSocketStream
+
+
+class TickerStream(WebSocketStream):
+    def __init__(self, url: str, stale_after: float = 5.0, **kwargs) -> None:
+        super().__init__(url, **kwargs)
+        self.stale_after = stale_after
+        self.codes: set[str] = set()
+        self.prices: dict[str, tuple[float, float]] = {}
+
+    async def subscribe(self, ticker: str) -> None:
+        if ticker in self.codes:
+            return
+
+        self.codes.add(ticker)
+        await self.send(self.subscription())
+
+    def get_price(self, ticker: str) -> float | None:
+        entry = self.prices.get(ticker)
+        if entry is None:
+            return None
+
+        price, received_at = entry
+        if time.monotonic() - received_at <= self.stale_after:
+            return price
+        return None
+
+    def subscription(self) -> list[dict]:
+        return [
+            {"ticket": str(uuid_lib.uuid4())},
+            {"type": "ticker", "codes": sorted(self.codes)},
+            {"format": "DEFAULT"},
+        ]
+
+    async def on_connect(self) -> None:
+        self.prices.clear()
+        if self.codes:
+            await self.send(self.subscription())
+
+    def on_message(self, message: dict) -> None:
+        if message.get("type") != "ticker":
+            return
+        self.prices[message["code"]] = (message["trade_price"], time.monotonic())
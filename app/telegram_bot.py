@@ -1,4 +1,5 @@
 import asyncio
+import html
 from enum import StrEnum
 from typing import TYPE_CHECKING
 import textwrap
@@ -14,7 +15,7 @@ from telegram.ext import (
     filters,
 )
 
-from .utils import retry
+from .utils import retry, metrics
 from config import Env
 
 if TYPE_CHECKING:
@@ -30,7 +31,9 @@ class TelegramBot:
     template = Template(
         textwrap.dedent(
             """\
-            <code>&lt;Estimated Profit&gt;
+            <code>[{{ ticker }}]
+
+            &lt;Estimated Profit&gt;
               7D:  {{ format_value(profit_7d, True, 12, 0) }} {{ format_rate(profit_rate_7d, 12) }}
               3M:  {{ format_value(profit_3m, True, 12, 0) }} {{ format_rate(profit_rate_3m, 12) }}
 
@@ -54,9 +57,9 @@ class TelegramBot:
     )
 
     def __init__(
-        self, trading_bot: "TradingBot", data_processor: "DataProcessor"
+        self, trading_bots: list["TradingBot"], data_processor: "DataProcessor"
     ) -> None:
-        self.trading_bot = trading_bot
+        self.trading_bots = trading_bots
         self.data_processor = data_processor
 
         self.TOKEN = Env.TOKEN
@@ -74,6 +77,7 @@ class TelegramBot:
         )
 
         self.application.add_handler(CommandHandler("start", self.start_handler))
+        self.application.add_handler(CommandHandler("metrics", self.metrics_handler))
         self.application.add_handler(
             MessageHandler(filters.TEXT & ~filters.COMMAND, self.message_handler)
         )
@@ -113,6 +117,20 @@ class TelegramBot:
             reply_markup=self.markup,
         )
 
+    @retry()
+    async def metrics_handler(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        if update.message is None:
+            return
+
+        summary = metrics.summary() or "No samples yet."
+        await update.message.reply_text(
+            f"<code>{html.escape(summary)}</code>",
+            reply_markup=self.markup,
+            parse_mode=ParseMode.HTML,
+        )
+
     @retry()
     async def message_handler(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -136,24 +154,26 @@ class TelegramBot:
             return
 
         async with self.execution_lock:
-            if self.trading_bot.is_running():
+            if any(bot.is_running() for bot in self.trading_bots):
                 await update.message.reply_text(
                     "Terminating Trading Bot ...",
                     reply_markup=self.markup,
                 )
-                await self.trading_bot.stop()
+                await asyncio.gather(*(bot.stop() for bot in self.trading_bots))
                 await update.message.reply_text(
                     "Trading Bot Terminated",
                     reply_markup=self.markup,
                 )
 
-            elif self.trading_bot.is_terminated():
+            elif all(bot.is_terminated() for bot in self.trading_bots):
                 await update.message.reply_text(
                     "Starting Trading Bot ...",
                     reply_markup=self.markup,
                 )
-                await self.trading_bot.initialize()
-                asyncio.create_task(self.trading_bot.start())
+                for bot in self.trading_bots:
+                    await bot.initialize()
+                for bot in self.trading_bots:
+                    asyncio.create_task(bot.start())
                 await update.message.reply_text(
                     "Trading Bot Started",
                     reply_markup=self.markup,
@@ -166,15 +186,16 @@ class TelegramBot:
         if update.message is None:
             return
 
-        dashboard = await self.data_processor.process()
-        await update.message.reply_photo(dashboard.trend, reply_markup=self.markup)
+        for bot in self.trading_bots:
+            dashboard = await self.data_processor.process(bot.TICKER)
+            await update.message.reply_photo(dashboard.trend, reply_markup=self.markup)
 
-        self.template_data.update(**vars(dashboard.status))
-        await update.message.reply_text(
-            self.template.render(self.template_data),
-            reply_markup=self.markup,
-            parse_mode=ParseMode.HTML,
-        )
+            self.template_data.update(**vars(dashboard.status))
+            await update.message.reply_text(
+                self.template.render(self.template_data),
+                reply_markup=self.markup,
+                parse_mode=ParseMode.HTML,
+            )
 
     async def start(self) -> None:
         await self.application.initialize()
@@ -186,7 +207,7 @@ class TelegramBot:
         await self.application.updater.start_polling()
 
     async def stop(self) -> None:
-        await self.trading_bot.stop()
+        await asyncio.gather(*(bot.stop() for bot in self.trading_bots))
 
         if self.application.updater is None:
             raise RuntimeError("Application updater is not initialized")
@@ -1,45 +1,271 @@
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import numpy as np
+from sqlalchemy import func, insert
 from sqlalchemy.future import select
 
+from .archive import high_water_id
+from .history_buffer import HistoryBuffer
 from .models import SessionLocal, History
+from .models.database import init_engine
+from .rollups import query_rollups, upsert_rollups
+from .utils import retry
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
 
 
 class Tracker:
-    async def record_trade(self, value: float, price: float, ratio: float) -> None:
-        async with SessionLocal() as session:
-            history = History(
-                timestamp=datetime.now(),
-                balance=value,
-                price=price,
-                ratio=ratio,
-            )
-            session.add(history)
-            await session.commit()
+    def __init__(
+        self,
+        retention: timedelta = timedelta(days=90),
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        spill_path: str | None = None,
+    ) -> None:
+        self.retention = retention
+        self.buffers: defaultdict[str, HistoryBuffer] = defaultdict(
+            lambda: HistoryBuffer(self.retention)
+        )
+        self.batch_size = batch_size
+        self.spill_path = spill_path
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task | None = None
+        self.next_id = 1
+        self.last_ids: defaultdict[str, int] = defaultdict(int)
+
+    async def initialize(self) -> None:
+        if self.spill_path is None:
+            database_dir = os.path.dirname(init_engine().url.database)
+            self.spill_path = os.path.join(database_dir, "history.spill.jsonl")
+        if not await self.replay_spilled():
+            logger.error(f"left unreplayed trade records in {self.spill_path}")
 
-    async def get_recent_histories(self) -> pd.DataFrame:
-        time_limit = datetime.now() - timedelta(days=90)
+        time_limit = datetime.now() - self.retention
 
         async with SessionLocal() as session:
             query = (
-                select(History)
+                select(
+                    History.market,
+                    History.timestamp,
+                    History.balance,
+                    History.price,
+                    History.ratio,
+                )
                 .where(History.timestamp >= time_limit)
                 .order_by(History.timestamp.asc())
             )
             result = await session.execute(query)
-            histories = result.scalars().all()
+            rows = result.all()
+
+            result = await session.execute(
+                select(History.market, func.max(History.id)).group_by(History.market)
+            )
+            last_ids = dict(result.all())
+            sequence = await high_water_id(session) or 0
+
+        spilled_ids = [
+            record[History.id.name]
+            for batch in await asyncio.to_thread(self.load_spilled)
+            for record in batch
+        ]
+        self.last_ids.update(last_ids)
+        self.next_id = max([*last_ids.values(), *spilled_ids, sequence]) + 1
+
+        rows_by_market = defaultdict(list)
+        for market, *row in rows:
+            rows_by_market[market].append(row)
+
+        for market, market_rows in rows_by_market.items():
+            timestamps, balances, prices, ratios = zip(*market_rows)
+            self.buffers[market].extend(
+                np.array(timestamps, dtype="datetime64[ns]"),
+                np.array(balances, dtype=float),
+                np.array(prices, dtype=float),
+                np.array(ratios, dtype=float),
+            )
+
+        self.writer = asyncio.create_task(self.write_behind())
+
+    async def record_trade(
+        self, market: str, value: float, price: float, ratio: float
+    ) -> None:
+        timestamp = datetime.now()
+        self.buffers[market].append(timestamp, value, price, ratio)
+        history_id = self.last_ids[market] = self.next_id
+        self.next_id += 1
+        await self.queue.put(
+            {
+                History.id.name: history_id,
+                History.market.name: market,
+                History.timestamp.name: timestamp,
+                History.balance.name: value,
+                History.price.name: price,
+                History.ratio.name: ratio,
+            }
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    async def write_behind(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            if self.queue_depth > self.queue.maxsize // 2:
+                logger.warning(f"trade queue depth: {self.queue_depth}")
+
+            replayed = True
+            if os.path.exists(self.spill_path):
+                replayed = await self.replay_spilled()
+            try:
+                await self.write_batch(batch)
+            except Exception:
+                await self.spill(batch)
+            else:
+                if not replayed:
+                    await asyncio.to_thread(self.quarantine_spilled)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
 
-        data = [(h.timestamp, h.balance, h.price, h.ratio) for h in histories]
+    async def spill(self, batch: list[dict]) -> None:
+        try:
+            await asyncio.to_thread(self.write_spilled, [batch], "a")
+        except OSError:
+            logger.exception(f"dropped {len(batch)} trade records")
+        else:
+            logger.error(f"spilled {len(batch)} trade records")
+
+    def write_spilled(self, batches: list[list[dict]], mode: str = "w") -> None:
+        path = self.spill_path if mode == "a" else f"{self.spill_path}.tmp"
+        with open(path, mode) as f:
+            for batch in batches:
+                f.write(json.dumps(batch, default=datetime.isoformat) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if path != self.spill_path:
+            os.replace(path, self.spill_path)
+
+    def load_spilled(self) -> list[list[dict]]:
+        if not os.path.exists(self.spill_path):
+            return []
+
+        batches = []
+        with open(self.spill_path) as f:
+            for line in filter(str.strip, f):
+                try:
+                    batch = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"skipped a corrupt line in {self.spill_path}")
+                    continue
+                for record in batch:
+                    timestamp = record[History.timestamp.name]
+                    record[History.timestamp.name] = datetime.fromisoformat(timestamp)
+                batches.append(batch)
+        return batches
+
+    async def replay_spilled(self) -> bool:
+        batches = await asyncio.to_thread(self.load_spilled)
+        for i, batch in enumerate(batches):
+            try:
+                await self.write_batch(batch)
+            except Exception as e:
+                logger.warning(f"failed to replay spilled trade records: {e}")
+                await asyncio.to_thread(self.write_spilled, batches[i:])
+                return False
+            logger.info(f"replayed {len(batch)} spilled trade records")
+
+        if os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+        return True
+
+    def quarantine_spilled(self) -> None:
+        batch, *batches = self.load_spilled()
+        with open(f"{self.spill_path}.quarantine", "a") as f:
+            f.write(json.dumps(batch, default=datetime.isoformat) + "\n")
+        if batches:
+            self.write_spilled(batches)
+        else:
+            os.remove(self.spill_path)
+        logger.error(
+            f"quarantined {len(batch)} trade records that failed to replay "
+            f"to {self.spill_path}.quarantine"
+        )
+
+    @retry()
+    async def write_batch(self, batch: list[dict]) -> None:
+        async with SessionLocal() as session:
+            await session.execute(insert(History), batch)
+            await upsert_rollups(session, batch)
+            await session.commit()
+
+    async def close(self) -> None:
+        if self.writer is None:
+            return
+
+        if not self.writer.done():
+            joined = asyncio.create_task(self.queue.join())
+            await asyncio.wait(
+                [joined, self.writer], return_when=asyncio.FIRST_COMPLETED
+            )
+            joined.cancel()
+
+        self.writer.cancel()
+        try:
+            await self.writer
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("trade writer failed")
+        self.writer = None
+
+        remaining = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+            self.queue.task_done()
+        if remaining:
+            await self.spill(remaining)
+
+    async def get_recent_histories(self, market: str) -> "pd.DataFrame":
+        import pandas as pd
+
+        buffer = self.buffers[market]
+        buffer.trim(datetime.now())
+        timestamps, balances, prices, ratios = buffer.columns()
 
         return pd.DataFrame(
-            data,
-            columns=pd.Index(
-                [
-                    History.timestamp.name,
-                    History.balance.name,
-                    History.price.name,
-                    History.ratio.name,
-                ]
-            ),
+            {
+                History.timestamp.name: timestamps,
+                History.balance.name: balances,
+                History.price.name: prices,
+                History.ratio.name: ratios,
+            },
+            copy=False,
         )
+
+    async def get_rollups(
+        self,
+        market: str,
+        start: datetime,
+        end: datetime | None = None,
+        max_points: int = 480,
+    ) -> "pd.DataFrame":
+        import pandas as pd
+
+        model, rows = await query_rollups(market, start, end, max_points)
+        columns = [c.name for c in model.__table__.c if c.name != "market"]
+        rollups = pd.DataFrame.from_records(rows, columns=columns)
+        rollups.attrs["resolution"] = model.resolution
+        return rollups
@@ -1,14 +1,17 @@
 import asyncio
-import os
+import time
 import logging
 from enum import Enum, auto
 from typing import TYPE_CHECKING
 
-from .utils import get_lower_price, get_upper_price, calc_ratio
-from config import ConfigKeys, config, Env
+from .poll_scheduler import PollScheduler
+from .strategy import GridStrategy
+from .utils import CircuitOpenError, get_tick_table, metrics
+from config import config
 
 if TYPE_CHECKING:
     from app.broker import Broker
+    from app.schemas import Order
     from app.tracker import Tracker
 
 logger = logging.getLogger(__name__)
@@ -24,41 +27,116 @@ class TradingBot:
         STOPPING = auto()
         TERMINATED = auto()
 
-    def __init__(self, broker: "Broker", tracker: "Tracker") -> None:
+    RECONCILE_INTERVAL = 10.0
+    PRICE_INTERVAL = 1.0
+    CIRCUIT_WAIT = 5.0
+    DUST = 1e-8
+    STAGES = (
+        "place_orders",
+        "wait_fill",
+        "update_balance",
+        "record_trade",
+        "cancel",
+        "fill_to_replace",
+    )
+
+    def __init__(
+        self,
+        broker: "Broker",
+        tracker: "Tracker",
+        ticker: str,
+        cash_share: float = 1.0,
+        strategy: GridStrategy | None = None,
+    ) -> None:
         self.broker = broker
         self.tracker = tracker
+        self.cash_share = cash_share
+        self.strategy = strategy or GridStrategy()
 
         self.state = self.State.TERMINATED
-        self.TICKER = Env.TICKER
-        self.CURRENCY = Env.CURRENCY
+        self.cash = 0.0
+        self.quantity = 0.0
+        self.TICKER = ticker
+        self.QUOTE, self.CURRENCY = ticker.split("-")
+        self.stage_timers = {
+            stage: metrics.histogram(
+                "trading_stage_seconds", ticker=ticker, stage=stage
+            )
+            for stage in self.STAGES
+        }
+        self.fills = metrics.counter("fills_total", ticker=ticker)
+        self.poll_scheduler = PollScheduler(get_tick_table(ticker))
 
     async def initialize(self) -> None:
         await self.broker.cancel_orders(self.TICKER)
-        await self.update_balance()
+        await self.update_balance(await self.broker.get_current_price(self.TICKER))
         await self.calibrate()
         self.update_pivot_price()
 
         self.state = self.State.INITIALIZED
 
-    async def update_balance(self) -> None:
+    async def update_balance(self, price: float, *uuids: str) -> None:
         balance_map = await self.broker.get_balances()
 
-        cash = balance_map.get("KRW")
-        self.cash = 0 if not cash else cash.balance + cash.locked
-
         coin = balance_map.get(self.CURRENCY)
-        self.quantity = 0 if not coin else coin.balance + coin.locked
-
-        logger.info(f"cash: {self.cash}, quantity: {self.quantity}")
+        quantity = 0 if not coin else coin.balance + coin.locked
+        quote = balance_map.get(self.QUOTE)
+        cash = 0 if not quote else quote.balance + quote.locked
+
+        if self.cash_share < 1:
+            cash = await self.update_ledger(
+                cash * self.cash_share, quantity, price, uuids
+            )
+
+        self.cash, self.quantity = cash, quantity
+        logger.info(f"{self.TICKER} cash: {self.cash}, quantity: {self.quantity}")
+
+    async def update_ledger(
+        self, cash: float, quantity: float, price: float, uuids: tuple[str, ...]
+    ) -> float:
+        ledger = config.get_ledger(self.TICKER)
+        if ledger is not None:
+            cash, held = ledger
+            order_map = await self.broker.get_orders(list(uuids)) if uuids else {}
+            for order in order_map.values():
+                cash, held = self.settle(order, price, cash, held)
+
+            unsettled = quantity - held
+            if abs(unsettled) > self.DUST:
+                logger.warning(
+                    f"{self.TICKER} settling {unsettled} unrecorded "
+                    f"{self.CURRENCY} at {price}"
+                )
+                cash -= unsettled * price
+
+        cash = max(cash, 0.0)
+        config.set_ledger(self.TICKER, cash, quantity)
+        await config.flush()
+        return cash
+
+    @staticmethod
+    def settle(
+        order: "Order", price: float, cash: float, held: float
+    ) -> tuple[float, float]:
+        funds = order.executed_funds
+        if funds is None:
+            if order.ord_type == "limit":
+                price = order.price
+            funds = order.executed_volume * price
+
+        if order.side == "bid":
+            return cash - funds - order.paid_fee, held + order.executed_volume
+        return cash + funds - order.paid_fee, held - order.executed_volume
 
     async def calibrate(self) -> None:
         cur_price = await self.broker.get_current_price(self.TICKER)
         self.last_price = await self.calc_optimal_price(cur_price)
         volume = self.calc_volume(cur_price)
 
-        logger.info(f"calibration volume: {volume}")
+        logger.info(f"{self.TICKER} calibration volume: {volume}")
 
-        if self.is_trade_profitable(cur_price) and abs(volume) >= 5000:
+        min_order = self.strategy.min_order
+        if self.is_trade_profitable(cur_price) and abs(volume) >= min_order:
             if volume > 0:
                 order = await self.broker.buy_market_order(self.TICKER, volume)
             else:
@@ -67,26 +145,18 @@ class TradingBot:
                 )
 
             await self.wait_order_closed(order.uuid)
-            await self.update_balance()
+            await self.update_balance(cur_price, order.uuid)
             await self.record_trade()
             self.last_price = await self.calc_optimal_price(cur_price)
 
     async def calc_optimal_price(self, cur_price: float) -> float:
-        min_volume = abs(self.calc_volume(cur_price))
-        optimal_price = cur_price
-
-        for func in (get_lower_price, get_upper_price):
-            price = cur_price
-            while True:
-                price = func(price)
-                volume = abs(self.calc_volume(price))
-
-                if volume < min_volume:
-                    min_volume = volume
-                    optimal_price = price
-                else:
-                    break
-        return optimal_price
+        return self.strategy.optimal_price(
+            get_tick_table(self.TICKER),
+            cur_price,
+            self.cash,
+            self.quantity,
+            config.get_pivot(self.TICKER),
+        )
 
     async def start(self) -> None:
         if self.state != self.State.INITIALIZED:
@@ -106,91 +176,176 @@ class TradingBot:
         await self.broker.cancel_orders(self.TICKER)
 
     async def run(self) -> None:
+        detected_at = None
         while self.state == self.State.RUNNING:
-            buy_uuid, sell_uuid, lower_price, upper_price = await self.place_orders()
-            any_closed, bought = await self.wait_any_closed(buy_uuid, sell_uuid)
-
-            if any_closed:
-                self.last_price = lower_price if bought else upper_price
-                self.update_pivot_price()
-                await self.update_balance()
-                await self.record_trade()
-
-                if bought:
-                    await self.broker.cancel_order(sell_uuid)
-                else:
-                    await self.broker.cancel_order(buy_uuid)
-
-        self.state = self.State.TERMINATED
+            try:
+                start = time.perf_counter()
+                buy_uuid, sell_uuid, lower_price, upper_price = (
+                    await self.place_orders()
+                )
+                placed_at = self.observe("place_orders", start)
+                if detected_at is not None:
+                    self.observe("fill_to_replace", detected_at)
+                    detected_at = None
 
-    async def place_orders(self) -> tuple[str, str, float, float]:
-        lower_price = self.last_price
-        while True:
-            volume = self.calc_volume(lower_price)
-            if self.is_trade_profitable(lower_price) and volume >= 5000:
-                quantity = volume / lower_price
-                buy_order = await self.broker.buy_limit_order(
-                    self.TICKER, lower_price, quantity
+                any_closed, bought = await self.wait_any_closed(
+                    buy_uuid, sell_uuid, lower_price, upper_price
                 )
-                break
+                waited_at = self.observe("wait_fill", placed_at)
+
+                if any_closed:
+                    self.fills.inc()
+                    detected_at = waited_at
+                    self.last_price = lower_price if bought else upper_price
+                    self.update_pivot_price()
+                    await self.update_balance(self.last_price, buy_uuid, sell_uuid)
+                    updated_at = self.observe("update_balance", waited_at)
+                    await self.record_trade()
+                    recorded_at = self.observe("record_trade", updated_at)
+
+                    if bought:
+                        await self.broker.cancel_order(sell_uuid)
+                    else:
+                        await self.broker.cancel_order(buy_uuid)
+                    self.observe("cancel", recorded_at)
+
+            except CircuitOpenError as e:
+                logger.warning(f"{self.TICKER} waiting out open circuit: {e}")
+                detected_at = None
+                await self.wait_out_circuit()
 
-            lower_price = get_lower_price(lower_price)
+        self.state = self.State.TERMINATED
 
-        upper_price = self.last_price
-        while True:
-            volume = -self.calc_volume(upper_price)
-            if self.is_trade_profitable(upper_price) and volume >= 5000:
-                quantity = volume / upper_price
-                sell_order = await self.broker.sell_limit_order(
-                    self.TICKER, upper_price, quantity
-                )
-                break
+    async def wait_out_circuit(self) -> None:
+        while self.state == self.State.RUNNING:
+            await asyncio.sleep(self.CIRCUIT_WAIT)
+            try:
+                await self.broker.cancel_orders(self.TICKER)
+                price = await self.broker.get_current_price(self.TICKER)
+                await self.update_balance(price)
+                return
+            except CircuitOpenError as e:
+                logger.warning(f"{self.TICKER} circuit still open: {e}")
+
+    def observe(self, stage: str, start: float) -> float:
+        now = time.perf_counter()
+        self.stage_timers[stage].record(now - start)
+        return now
 
-            upper_price = get_upper_price(upper_price)
+    async def place_orders(self) -> tuple[str, str, float, float]:
+        lower_price, upper_price = self.strategy.order_prices(
+            get_tick_table(self.TICKER),
+            self.last_price,
+            self.cash,
+            self.quantity,
+            config.get_pivot(self.TICKER),
+        )
+
+        if lower_price is None:
+            raise ValueError(f"No buy price above zero for {self.TICKER}")
+        volume = self.calc_volume(lower_price)
+        buy_order = await self.broker.buy_limit_order(
+            self.TICKER, lower_price, volume / lower_price
+        )
+
+        if upper_price is None:
+            raise ValueError(f"No sell price for {self.TICKER}")
+        volume = -self.calc_volume(upper_price)
+        sell_order = await self.broker.sell_limit_order(
+            self.TICKER, upper_price, volume / upper_price
+        )
 
         return buy_order.uuid, sell_order.uuid, lower_price, upper_price
 
     async def wait_any_closed(
-        self, buy_uuid: str, sell_uuid: str
+        self, buy_uuid: str, sell_uuid: str, lower_price: float, upper_price: float
     ) -> tuple[bool, bool | None]:
-        while self.state == self.State.RUNNING:
-            order_map = await self.broker.get_orders([buy_uuid, sell_uuid])
-
-            if (
-                order_map[buy_uuid].state == "done"
-                or order_map[buy_uuid].state == "cancel"
-            ):
-                return True, True
+        order_stream = self.broker.order_stream
+        waiters = {
+            order_stream.wait_closed(buy_uuid): True,
+            order_stream.wait_closed(sell_uuid): False,
+        }
+        uuids = [buy_uuid, sell_uuid]
+        next_reconcile = time.monotonic() + self.RECONCILE_INTERVAL
+        self.poll_scheduler.reset()
+
+        try:
+            while self.state == self.State.RUNNING:
+                if order_stream.is_connected():
+                    timeout = self.PRICE_INTERVAL
+                    self.observe_price()
+                    if time.monotonic() >= next_reconcile:
+                        await self.reconcile_orders(uuids)
+                        next_reconcile = time.monotonic() + self.RECONCILE_INTERVAL
+                else:
+                    timeout = await self.poll_orders(uuids, lower_price, upper_price)
 
-            if (
-                order_map[sell_uuid].state == "done"
-                or order_map[sell_uuid].state == "cancel"
-            ):
-                return True, False
+                done, _ = await asyncio.wait(
+                    waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if done:
+                    return True, any(waiters[future] for future in done)
 
-            await asyncio.sleep(1)
+            return False, None
 
-        return False, None
+        finally:
+            order_stream.discard(buy_uuid)
+            order_stream.discard(sell_uuid)
 
     async def wait_order_closed(self, uuid: str) -> None:
-        while True:
-            order = await self.broker.get_order(uuid)
-            if order.state == "done" or order.state == "cancel":
-                break
-            await asyncio.sleep(0.5)
+        order_stream = self.broker.order_stream
+        waiter = order_stream.wait_closed(uuid)
+
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(waiter), timeout=self.reconcile_interval()
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    await self.reconcile_orders([uuid])
+        finally:
+            order_stream.discard(uuid)
+
+    def observe_price(self) -> None:
+        price = self.broker.ticker_stream.get_price(self.TICKER)
+        if price is not None:
+            self.poll_scheduler.observe(price, time.monotonic())
+
+    async def poll_orders(
+        self, uuids: list[str], lower_price: float, upper_price: float
+    ) -> float:
+        price = await self.broker.get_current_price(self.TICKER)
+        delay = self.poll_scheduler.schedule(price, lower_price, upper_price)
+        if delay <= 0:
+            await self.reconcile_orders(uuids)
+            delay = self.poll_scheduler.polled()
+        return min(delay, self.PRICE_INTERVAL)
+
+    async def reconcile_orders(self, uuids: list[str]) -> None:
+        order_map = await self.broker.get_orders(uuids)
+        for uuid, order in order_map.items():
+            self.broker.order_stream.resolve(uuid, order.state)
+
+    def reconcile_interval(self) -> float:
+        if self.broker.order_stream.is_connected():
+            return self.RECONCILE_INTERVAL
+        return 1.0
 
     def is_trade_profitable(self, price: float) -> bool:
-        return abs(self.last_price - price) / self.last_price >= 0.005
+        return self.strategy.is_trade_profitable(self.last_price, price)
 
     def update_pivot_price(self) -> None:
-        pivot_price = config.get(ConfigKeys.PIVOT)
-        if self.last_price >= pivot_price * 2:
-            config.set(ConfigKeys.PIVOT, self.last_price / 2)
+        pivot_price = config.get_pivot(self.TICKER)
+        next_pivot = self.strategy.next_pivot(self.last_price, pivot_price)
+        if next_pivot != pivot_price:
+            config.set_pivot(self.TICKER, next_pivot)
 
     def calc_volume(self, price: float) -> float:
-        ratio = calc_ratio(price, config.get(ConfigKeys.PIVOT))
-        value = self.quantity * price + self.cash
-        return self.cash - value * ratio
+        return self.strategy.calc_volume(
+            price, self.cash, self.quantity, config.get_pivot(self.TICKER)
+        )
 
     def is_running(self) -> bool:
         return self.state == self.State.RUNNING
@@ -201,4 +356,4 @@ class TradingBot:
     async def record_trade(self) -> None:
         value = self.cash + self.quantity * self.last_price
         ratio = self.cash / value
-        await self.tracker.record_trade(value, self.last_price, ratio)
+        await self.tracker.record_trade(self.TICKER, value, self.last_price, ratio)
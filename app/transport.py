@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+import aiohttp
+
+
+@dataclass
+class TransportConfig:
+    limit: int = 32
+    limit_per_host: int = 16
+    keepalive_timeout: float = 60.0
+    dns_cache_ttl: int = 300
+    total_timeout: float = 10.0
+    connect_timeout: float = 3.0
+
+
+def create_session(config: TransportConfig) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=config.dns_cache_ttl,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=config.total_timeout, connect=config.connect_timeout
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
@@ -1,4 +1,36 @@
-from .price_utils import calc_ratio, get_lower_price, get_upper_price
-from .exception_handler import retry
+from .price_utils import (
+    calc_ratio,
+    get_lower_price,
+    get_upper_price,
+    get_tick_table,
+    gallop,
+    TickTable,
+)
+from .ratio_integral import log_balance_change
+from .sampling import lttb, sliding_extrema
+from .jwt_signer import JWTSigner
+from .cache import TTLCache
+from .batcher import Batcher
+from .exception_handler import retry, CircuitBreaker, CircuitOpenError
+from .metrics import metrics, Metrics, Histogram
 
-__all__ = ["calc_ratio", "get_lower_price", "get_upper_price", "retry"]
+__all__ = [
+    "calc_ratio",
+    "get_lower_price",
+    "get_upper_price",
+    "get_tick_table",
+    "gallop",
+    "TickTable",
+    "log_balance_change",
+    "lttb",
+    "sliding_extrema",
+    "JWTSigner",
+    "TTLCache",
+    "Batcher",
+    "retry",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "metrics",
+    "Metrics",
+    "Histogram",
+]
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class Batcher(Generic[K, V]):
+    def __init__(
+        self,
+        fetch: Callable[[list[K]], Awaitable[dict[K, V]]],
+        max_size: int = 100,
+        delay: float = 0.0,
+    ) -> None:
+        self.fetch = fetch
+        self.max_size = max_size
+        self.delay = delay
+        self.pending: dict[K, asyncio.Future[V]] = {}
+        self.handle: asyncio.TimerHandle | None = None
+        self.tasks: set[asyncio.Task] = set()
+
+    async def get(self, key: K) -> V:
+        future = self.pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self.pending[key] = future
+
+            if len(self.pending) >= self.max_size:
+                self.flush()
+            elif self.handle is None:
+                self.handle = loop.call_later(self.delay, self.flush)
+
+        return await asyncio.shield(future)
+
+    def flush(self) -> None:
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+        batch, self.pending = self.pending, {}
+        if batch:
+            task = asyncio.create_task(self.resolve(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def resolve(self, batch: dict[K, asyncio.Future[V]]) -> None:
+        try:
+            results = await self.fetch(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()
+            return
+
+        for key, future in batch.items():
+            if future.done():
+                continue
+            result = results.get(key)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+                future.exception()
+            elif key in results:
+                future.set_result(result)
+            else:
+                future.set_exception(ValueError(f"Missing result for {key!r}"))
+                future.exception()
@@ -0,0 +1,53 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    def __init__(self) -> None:
+        self.entries: dict[Hashable, tuple[float, Any]] = {}
+        self.inflight: dict[Hashable, asyncio.Task] = {}
+        self.versions: dict[Hashable, int] = {}
+
+    async def get(
+        self, key: Hashable, loader: Callable[[], Awaitable[T]], ttl: float
+    ) -> T:
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        task = self.inflight.get(key)
+        if task is None:
+            version = self.versions.get(key, 0)
+            task = asyncio.create_task(self.load(key, loader, ttl, version))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        ttl: float,
+        version: int,
+    ) -> T:
+        try:
+            value = await loader()
+        finally:
+            if self.inflight.get(key) is asyncio.current_task():
+                del self.inflight[key]
+
+        if self.versions.get(key, 0) == version:
+            self.entries[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def prune(self) -> None:
+        now = time.monotonic()
+        self.entries = {k: e for k, e in self.entries.items() if e[0] > now}
+
+    def invalidate(self, key: Hashable) -> None:
+        self.versions[key] = self.versions.get(key, 0) + 1
+        self.entries.pop(key, None)
+        self.inflight.pop(key, None)
@@ -1,65 +1,149 @@
 import asyncio
+import random
 import time
 import functools
 import inspect
 import logging
+from typing import Callable
 
+from .metrics import metrics
 
-def retry(max_attempts: int = 3, delay: float = 1.0, exceptions=(Exception,)):
+
+class CircuitOpenError(Exception): ...
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return False
+        if self.probe_at is not None and now - self.probe_at < self.reset_timeout:
+            return False
+        self.probe_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probe_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probe_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self.probe_at = None
+
+
+def is_retryable(e: BaseException) -> bool:
+    status = getattr(e, "status", None)
+    if isinstance(status, int) and 400 <= status < 500 and status != 429:
+        return False
+    return not isinstance(e, CircuitOpenError)
+
+
+def retry(
+    max_attempts: int = 3,
+    delay: float = 1.0,
+    exceptions=(Exception,),
+    backoff: float = 2.0,
+    max_delay: float = 30.0,
+    jitter: float = 0.1,
+    retry_if: Callable[[BaseException], bool] = is_retryable,
+    circuit_breaker: CircuitBreaker | None = None,
+):
     def decorator(func):
         module = inspect.getmodule(func)
         module_name = module.__name__ if module else "unknown"
         logger = logging.getLogger(module_name)
+        signature = inspect.signature(func)
+        retries = metrics.counter("retries_total", call=func.__name__)
 
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            bound_args = inspect.signature(func).bind(*args, **kwargs)
+        def format_call(args, kwargs) -> str:
+            bound_args = signature.bind(*args, **kwargs)
             bound_args.apply_defaults()
             formatted_args = ", ".join(
                 f"{k}={v!r}" for k, v in bound_args.arguments.items()
             )
-            formatted_call = f"{func.__name__}({formatted_args})"
+            return f"{func.__name__}({formatted_args})"
+
+        def check_circuit(args, kwargs) -> None:
+            if circuit_breaker is not None and not circuit_breaker.allow():
+                raise CircuitOpenError(
+                    f"{format_call(args, kwargs)} rejected: circuit open"
+                )
+
+        def on_failure(e: Exception, attempt: int, args, kwargs) -> float | None:
+            retryable = retry_if(e)
+            if circuit_breaker is not None:
+                if retryable:
+                    circuit_breaker.record_failure()
+                elif getattr(e, "status", None) is not None:
+                    circuit_breaker.record_success()
+
+            if retryable and attempt < max_attempts:
+                wait = min(delay * backoff ** (attempt - 1), max_delay)
+                wait *= 1 + random.uniform(-jitter, jitter)
+                retries.inc()
+                logger.warning(
+                    f"{format_call(args, kwargs)} failed (attempt {attempt}/{max_attempts}): {e}"
+                )
+                return wait
 
+            logger.error(
+                f"{format_call(args, kwargs)} failed after {attempt} attempts",
+                exc_info=True,
+            )
+            return None
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
             for attempt in range(1, max_attempts + 1):
+                check_circuit(args, kwargs)
                 try:
-                    return await func(*args, **kwargs)
+                    result = await func(*args, **kwargs)
                 except exceptions as e:
-                    if attempt < max_attempts:
-                        logger.warning(
-                            f"{formatted_call} failed (attempt {attempt}/{max_attempts}): {e}"
-                        )
-                        await asyncio.sleep(delay)
-                    else:
-                        logger.error(
-                            f"{formatted_call} failed after {max_attempts} attempts",
-                            exc_info=True,
-                        )
+                    wait = on_failure(e, attempt, args, kwargs)
+                    if wait is None:
                         raise
+                    await asyncio.sleep(wait)
+                else:
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_success()
+                    return result
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            bound_args = inspect.signature(func).bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            formatted_args = ", ".join(
-                f"{k}={v!r}" for k, v in bound_args.arguments.items()
-            )
-            formatted_call = f"{func.__name__}({formatted_args})"
-
             for attempt in range(1, max_attempts + 1):
+                check_circuit(args, kwargs)
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except exceptions as e:
-                    if attempt < max_attempts:
-                        logger.warning(
-                            f"{formatted_call} failed (attempt {attempt}/{max_attempts}): {e}"
-                        )
-                        time.sleep(delay)
-                    else:
-                        logger.error(
-                            f"{formatted_call} failed after {max_attempts} attempts",
-                            exc_info=True,
-                        )
+                    wait = on_failure(e, attempt, args, kwargs)
+                    if wait is None:
                         raise
+                    time.sleep(wait)
+                else:
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_success()
+                    return result
 
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
@@ -0,0 +1,32 @@
+import base64
+import hashlib
+import hmac
+import json
+import uuid as uuid_lib
+
+
+def b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+class JWTSigner:
+    HEADER = b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+    def __init__(self, access_key: str, secret_key: str) -> None:
+        self.hmac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+        self.payload_prefix = '{"access_key":' + json.dumps(access_key) + ',"nonce":"'
+
+    def sign(self, query_hash: str | None = None, nonce: str | None = None) -> str:
+        if nonce is None:
+            nonce = str(uuid_lib.uuid4())
+
+        payload = self.payload_prefix + nonce
+        if query_hash is None:
+            payload += '"}'
+        else:
+            payload += '","query_hash":"' + query_hash + '","query_hash_alg":"SHA512"}'
+
+        signing_input = self.HEADER + b"." + b64url(payload.encode("utf-8"))
+        mac = self.hmac.copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + b64url(mac.digest())).decode("ascii")
@@ -0,0 +1,169 @@
+import asyncio
+import functools
+import time
+from collections import defaultdict
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Histogram:
+    SUB_BITS = 5
+
+    def __init__(self, unit: float = 1e-6, max_value: float = 3600.0) -> None:
+        self.unit = unit
+        self.scale = 1 / unit
+        self.sub_count = 1 << self.SUB_BITS
+        self.half = self.sub_count >> 1
+        self.max_index = self.index(int(max_value * self.scale))
+        self.counts = [0] * (self.max_index + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def index(self, units: int) -> int:
+        if units < self.sub_count:
+            return units
+        shift = units.bit_length() - self.SUB_BITS
+        return shift * self.half + (units >> shift)
+
+    def bounds(self, index: int) -> tuple[float, float]:
+        if index < self.sub_count:
+            return index * self.unit, (index + 1) * self.unit
+        shift = index // self.half - 1
+        lower = (index - shift * self.half) << shift
+        return lower * self.unit, (lower + (1 << shift)) * self.unit
+
+    def record(self, value: float) -> None:
+        units = int(value * self.scale)
+        if units < self.sub_count:
+            index = units
+        else:
+            shift = units.bit_length() - self.SUB_BITS
+            index = shift * self.half + (units >> shift)
+            if index > self.max_index:
+                index = self.max_index
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(self.bounds(index)[1], self.max)
+        return self.max
+
+
+class Metrics:
+    QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+    def __init__(self) -> None:
+        self.histograms: defaultdict[str, dict[tuple, Histogram]] = defaultdict(dict)
+        self.counters: defaultdict[str, dict[tuple, Counter]] = defaultdict(dict)
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        series = self.histograms[name]
+        key = tuple(labels.items())
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        return histogram
+
+    def counter(self, name: str, **labels: str) -> Counter:
+        series = self.counters[name]
+        key = tuple(labels.items())
+        counter = series.get(key)
+        if counter is None:
+            counter = series[key] = Counter()
+        return counter
+
+    def timed(self, name: str, **labels: str):
+        def decorator(func):
+            histogram = self.histogram(name, call=func.__name__, **labels)
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.record(time.perf_counter() - start)
+
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    histogram.record(time.perf_counter() - start)
+
+            if asyncio.iscoroutinefunction(func):
+                return async_wrapper
+            else:
+                return sync_wrapper
+
+        return decorator
+
+    @staticmethod
+    def format_labels(key: tuple, *extra: tuple[str, str]) -> str:
+        pairs = [*key, *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+    def render(self) -> str:
+        lines = []
+        for name, series in self.counters.items():
+            lines.append(f"# TYPE {name} counter")
+            for key, counter in series.items():
+                lines.append(f"{name}{self.format_labels(key)} {counter.value}")
+
+        for name, series in self.histograms.items():
+            lines.append(f"# TYPE {name} summary")
+            for key, histogram in series.items():
+                for q in self.QUANTILES:
+                    labels = self.format_labels(key, ("quantile", str(q)))
+                    lines.append(f"{name}{labels} {histogram.quantile(q):.6g}")
+                labels = self.format_labels(key)
+                lines.append(f"{name}_sum{labels} {histogram.sum:.6g}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        lines = []
+        for name, series in self.histograms.items():
+            for key, histogram in series.items():
+                if not histogram.count:
+                    continue
+                label = ",".join(str(v) for _, v in key)
+                lines.append(
+                    f"{name}[{label}]: n={histogram.count} "
+                    f"p50={histogram.quantile(0.5) * 1e3:.1f} "
+                    f"p99={histogram.quantile(0.99) * 1e3:.1f} "
+                    f"max={histogram.max * 1e3:.1f}ms"
+                )
+
+        for name, series in self.counters.items():
+            for key, counter in series.items():
+                if counter.value:
+                    label = ",".join(str(v) for _, v in key)
+                    lines.append(f"{name}[{label}]: {counter.value}")
+        return "\n".join(lines)
+
+
+metrics = Metrics()
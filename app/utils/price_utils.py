@@ -1,61 +1,122 @@
-from decimal import Decimal
-import numpy as np
+from bisect import bisect_right
+from functools import cache
+from typing import Callable
 
 
-def calc_ratio(price: float, pivot_price: float):
+def calc_ratio(
+    price: float, pivot_price: float, exponent: float = 2, max_ratio: float = 0.875
+):
     if price >= pivot_price:
         delta = (price / pivot_price) - 1
-        ratio = -0.5 * (2 ** -(2 * delta)) + 1
+        ratio = -0.5 * (2 ** -(exponent * delta)) + 1
     else:
         delta = (pivot_price / price) - 1
-        ratio = 0.5 * (2 ** -(2 * delta))
-    return np.clip(ratio, 0, 0.875)
-
-
-def get_price_step(current_price: float) -> float:
-    if current_price >= 2_000_000:
-        return 1_000
-    elif current_price >= 1_000_000:
-        return 500
-    elif current_price >= 500_000:
-        return 100
-    elif current_price >= 100_000:
-        return 50
-    elif current_price >= 10_000:
-        return 10
-    elif current_price >= 1_000:
-        return 1
-    elif current_price >= 100:
-        return 0.1
-    elif current_price >= 10:
-        return 0.01
-    elif current_price >= 1:
-        return 0.001
-    elif current_price >= 0.1:
-        return 0.0001
-    elif current_price >= 0.01:
-        return 0.00001
-    elif current_price >= 0.001:
-        return 0.000001
-    elif current_price >= 0.0001:
-        return 0.0000001
-    else:
-        return 0.00000001
+        ratio = 0.5 * (2 ** -(exponent * delta))
+    return min(max(ratio, 0.0), max_ratio)
+
+
+class TickTable:
+    SCALE = 10**8
+
+    def __init__(self, bands: list[tuple[float, float]]) -> None:
+        self.bound_prices = [bound for bound, _ in bands]
+        self.step_prices = [step for _, step in bands]
+        self.bounds = [round(bound * self.SCALE) for bound in self.bound_prices]
+        self.steps = [round(step * self.SCALE) for step in self.step_prices]
+
+        self.starts = [0]
+        for i in range(1, len(bands)):
+            n_ticks = (self.bounds[i] - self.bounds[i - 1]) // self.steps[i - 1]
+            self.starts.append(self.starts[-1] + n_ticks)
+
+    def step(self, price: float) -> float:
+        band = max(bisect_right(self.bound_prices, price) - 1, 0)
+        return self.step_prices[band]
+
+    def index(self, price: float) -> int:
+        units = round(price * self.SCALE)
+        band = max(bisect_right(self.bounds, units) - 1, 0)
+        offset = round((units - self.bounds[band]) / self.steps[band])
+        return self.starts[band] + offset
+
+    def price(self, index: int) -> float:
+        band = max(bisect_right(self.starts, index) - 1, 0)
+        units = self.bounds[band] + (index - self.starts[band]) * self.steps[band]
+        return units / self.SCALE
+
+
+TICK_BANDS: dict[str, list[tuple[float, float]]] = {
+    "KRW": [
+        (0, 0.00000001),
+        (0.0001, 0.0000001),
+        (0.001, 0.000001),
+        (0.01, 0.00001),
+        (0.1, 0.0001),
+        (1, 0.001),
+        (10, 0.01),
+        (100, 0.1),
+        (1_000, 1),
+        (10_000, 10),
+        (100_000, 50),
+        (500_000, 100),
+        (1_000_000, 500),
+        (2_000_000, 1_000),
+    ],
+    "BTC": [(0, 0.00000001)],
+    "USDT": [
+        (0, 0.00000001),
+        (0.0001, 0.0000001),
+        (0.001, 0.000001),
+        (0.01, 0.00001),
+        (0.1, 0.0001),
+        (1, 0.001),
+        (10, 0.01),
+    ],
+}
+
+
+@cache
+def get_tick_table(market: str = "KRW") -> TickTable:
+    quote = market.split("-")[0]
+    return TickTable(TICK_BANDS[quote])
+
+
+def get_price_step(current_price: float, market: str = "KRW") -> float:
+    return get_tick_table(market).step(current_price)
 
 
-def get_upper_price(price: float) -> float:
-    step = get_price_step(price)
-    return precise_addition(price, step)
+def get_upper_price(price: float, market: str = "KRW") -> float:
+    table = get_tick_table(market)
+    return table.price(table.index(price) + 1)
 
 
-def get_lower_price(price: float) -> float:
-    step = get_price_step(price - 1e-6)
-    return precise_substraction(price, step)
+def get_lower_price(price: float, market: str = "KRW") -> float:
+    table = get_tick_table(market)
+    return table.price(table.index(price) - 1)
 
 
-def precise_addition(a: float, b: float) -> float:
-    return float(Decimal(str(a)) + Decimal(str(b)))
+def gallop(
+    predicate: Callable[[int], bool], start: int = 0, limit: int | None = None
+) -> int | None:
+    if predicate(start):
+        return start
 
+    lo, step = start, 1
+    while True:
+        hi = start + step
+        if limit is not None and hi >= limit:
+            hi = limit
+            if not predicate(hi):
+                return None
+            break
+        if predicate(hi):
+            break
+        lo, step = hi, step * 2
 
-def precise_substraction(a: float, b: float) -> float:
-    return float(Decimal(str(a)) - Decimal(str(b)))
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if predicate(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
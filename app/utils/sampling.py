@@ -0,0 +1,65 @@
+from collections import deque
+
+import numpy as np
+
+
+def sliding_extrema(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    n = len(values)
+    vals = values.tolist()
+    min_vals = np.empty(n)
+    max_vals = np.empty(n)
+
+    min_queue: deque[int] = deque()
+    max_queue: deque[int] = deque()
+    right = 0
+
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        while right < end:
+            value = vals[right]
+            while min_queue and vals[min_queue[-1]] >= value:
+                min_queue.pop()
+            min_queue.append(right)
+            while max_queue and vals[max_queue[-1]] <= value:
+                max_queue.pop()
+            max_queue.append(right)
+            right += 1
+
+        while min_queue[0] < start:
+            min_queue.popleft()
+        while max_queue[0] < start:
+            max_queue.popleft()
+
+        min_vals[i] = vals[min_queue[0]]
+        max_vals[i] = vals[max_queue[0]]
+
+    return min_vals, max_vals
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = (x - x[0]).astype(float)
+    y = y.astype(float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from bisect import bisect_right
+
+from app.broker import Broker
+from app.models import init_db
+from app.tracker import Tracker
+from app.trading_bot import TradingBot
+from config import Env, config
+
+from .fake_upbit import FakeUpbit, random_walk
+from .stats import format_percentiles
+
+
+def fill_to_replace(fills: list[float], placements: list[float]) -> list[float]:
+    samples = []
+    for filled_at in fills:
+        i = bisect_right(placements, filled_at)
+        if i + 1 < len(placements):
+            samples.append(placements[i + 1] - filled_at)
+    return samples
+
+
+async def main(args: argparse.Namespace) -> None:
+    ticker = Env.TICKERS[0]
+    exchange = FakeUpbit(
+        Env.ACCESS,
+        Env.SECRET,
+        market=ticker,
+        prices=random_walk(args.price, args.volatility, ticker, args.seed),
+        tick_interval=args.tick_interval,
+        cash=args.cash,
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        streams=not args.no_streams,
+        seed=args.seed,
+    )
+    url = await exchange.start()
+    ws_url = url.replace("http", "ws", 1)
+
+    broker = Broker(
+        upbit_url=url,
+        upbit_ws_url=f"{ws_url}/websocket/v1",
+        upbit_private_ws_url=f"{ws_url}/websocket/v1/private",
+        datalab_url=url,
+    )
+    tracker = Tracker()
+    data_dir = tempfile.mkdtemp(prefix="fake-upbit-")
+    config.load(os.path.join(data_dir, "config.json"))
+    config.set_pivot(ticker, args.price)
+
+    await init_db(data_dir)
+    broker.initialize()
+    await tracker.initialize()
+    bot = TradingBot(broker, tracker, ticker)
+
+    try:
+        await bot.initialize()
+        requests_before = exchange.request_counts.copy()
+        fills_before = len(exchange.fills)
+
+        task = asyncio.create_task(bot.start())
+        start = time.perf_counter()
+        while (
+            time.perf_counter() - start < args.duration
+            and len(exchange.fills) - fills_before < args.fills
+        ):
+            await asyncio.sleep(0.1)
+        await bot.stop()
+        await task
+    finally:
+        await tracker.close()
+        await config.flush()
+        await broker.close()
+        await exchange.stop()
+
+    n_fills = len(exchange.fills) - fills_before
+    requests = exchange.request_counts - requests_before
+    mode = "rest" if args.no_streams else "streams"
+    samples = fill_to_replace(exchange.fills[fills_before:], exchange.placements)
+
+    print(f"mode={mode} fills={n_fills} throttled={exchange.throttled}")
+    if samples:
+        print(format_percentiles("fill→replace", samples))
+    if n_fills:
+        print(f"requests/fill: {sum(requests.values()) / n_fills:.2f}")
+    for endpoint, count in requests.most_common():
+        print(f"  {endpoint:<28} {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TradingBot against a fake Upbit")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--fills", type=int, default=100)
+    parser.add_argument("--price", type=float, default=100_000_000)
+    parser.add_argument("--volatility", type=float, default=0.002)
+    parser.add_argument("--tick-interval", type=float, default=0.05)
+    parser.add_argument("--cash", type=float, default=10_000_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--no-streams", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
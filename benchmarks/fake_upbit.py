@@ -0,0 +1,507 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import random
+import time
+import uuid as uuid_lib
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator
+from urllib.parse import unquote, urlencode
+
+from aiohttp import WSMsgType, web
+
+from app.utils import get_tick_table
+
+GROUP_LIMITS: dict[str, tuple[int, float]] = {
+    "quotation": (10, 1.0),
+    "default": (30, 1.0),
+    "order": (8, 1.0),
+    "order-cancel-all": (1, 2.0),
+}
+
+
+def random_walk(
+    start: float,
+    volatility: float = 0.002,
+    market: str = "KRW-BTC",
+    seed: int | None = None,
+) -> Iterator[float]:
+    rng = random.Random(seed)
+    table = get_tick_table(market)
+    price = start
+    while True:
+        yield table.price(table.index(price))
+        price *= 1 + rng.gauss(0, volatility)
+
+
+@dataclass
+class FakeOrder:
+    market: str
+    side: str
+    ord_type: str
+    price: float | None
+    volume: float | None
+    locked: float
+    reserved_fee: float
+    uuid: str = field(default_factory=lambda: str(uuid_lib.uuid4()))
+    state: str = "wait"
+    created_at: str = field(
+        default_factory=lambda: datetime.now().astimezone().isoformat()
+    )
+    executed_volume: float = 0.0
+    executed_funds: float = 0.0
+    paid_fee: float = 0.0
+    trades_count: int = 0
+
+    def to_json(self) -> dict:
+        remaining = None if self.volume is None else self.volume - self.executed_volume
+        return {
+            "uuid": self.uuid,
+            "side": self.side,
+            "ord_type": self.ord_type,
+            "price": None if self.price is None else str(self.price),
+            "state": self.state,
+            "market": self.market,
+            "created_at": self.created_at,
+            "volume": None if self.volume is None else str(self.volume),
+            "remaining_volume": None if remaining is None else str(remaining),
+            "reserved_fee": str(self.reserved_fee),
+            "remaining_fee": str(self.reserved_fee - self.paid_fee),
+            "paid_fee": str(self.paid_fee),
+            "locked": str(self.locked),
+            "executed_volume": str(self.executed_volume),
+            "executed_funds": str(self.executed_funds),
+            "trades_count": self.trades_count,
+        }
+
+
+class FakeUpbit:
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        market: str = "KRW-BTC",
+        prices: Iterator[float] | None = None,
+        tick_interval: float = 0.05,
+        cash: float = 10_000_000,
+        quantity: float = 0.0,
+        fee: float = 0.0005,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        streams: bool = True,
+        seed: int | None = None,
+    ) -> None:
+        self.access_key = access_key
+        self.secret_key = secret_key.encode("utf-8")
+        self.market = market
+        self.quote, self.currency = market.split("-")
+        self.prices = prices or random_walk(100_000_000, market=market, seed=seed)
+        self.tick_interval = tick_interval
+        self.fee = fee
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.streams = streams
+        self.rng = random.Random(seed)
+        self.table = get_tick_table(market)
+
+        self.price = next(self.prices)
+        self.balances = {self.quote: cash, self.currency: quantity}
+        self.locked = {self.quote: 0.0, self.currency: 0.0}
+        self.orders: dict[str, FakeOrder] = {}
+        self.open_orders: dict[str, FakeOrder] = {}
+        self.nonces: set[str] = set()
+        self.windows: dict[str, deque[float]] = {g: deque() for g in GROUP_LIMITS}
+
+        self.request_counts: Counter[str] = Counter()
+        self.throttled = 0
+        self.fills: list[float] = []
+        self.placements: list[float] = []
+
+        self.ticker_clients: set[web.WebSocketResponse] = set()
+        self.order_clients: set[web.WebSocketResponse] = set()
+        self.ticker_task: asyncio.Task | None = None
+
+        self.app = web.Application(middlewares=[self.middleware])
+        self.app.router.add_get("/v1/ticker", self.get_ticker)
+        self.app.router.add_get("/v1/accounts", self.get_accounts)
+        self.app.router.add_post("/v1/orders", self.post_order)
+        self.app.router.add_get("/v1/order", self.get_order)
+        self.app.router.add_delete("/v1/order", self.delete_order)
+        self.app.router.add_get("/v1/orders/uuids", self.get_orders)
+        self.app.router.add_delete("/v1/orders/open", self.delete_open_orders)
+        self.app.router.add_get("/api/v1/indicator/fear/assets", self.get_fgi)
+        if streams:
+            self.app.router.add_get("/websocket/v1", self.ticker_ws)
+            self.app.router.add_get("/websocket/v1/private", self.order_ws)
+        self.app.on_startup.append(self.on_startup)
+        self.app.on_shutdown.append(self.on_shutdown)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+    async def on_startup(self, app: web.Application) -> None:
+        self.ticker_task = asyncio.create_task(self.run_prices())
+
+    async def on_shutdown(self, app: web.Application) -> None:
+        if self.ticker_task is not None:
+            self.ticker_task.cancel()
+        for ws in self.ticker_clients | self.order_clients:
+            await ws.close()
+
+    async def run_prices(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            self.price = next(self.prices)
+            self.match()
+            await self.broadcast(
+                self.ticker_clients,
+                {"type": "ticker", "code": self.market, "trade_price": self.price},
+            )
+
+    def match(self) -> None:
+        for order in list(self.open_orders.values()):
+            if order.side == "bid" and self.price <= order.price:
+                self.fill(order, order.price, order.volume)
+            elif order.side == "ask" and self.price >= order.price:
+                self.fill(order, order.price, order.volume)
+
+    def fill(self, order: FakeOrder, price: float, volume: float) -> None:
+        funds = price * volume
+        fee = funds * self.fee
+        if order.side == "bid":
+            self.locked[self.quote] -= order.locked
+            self.balances[self.quote] += order.locked - funds - fee
+            self.balances[self.currency] += volume
+        else:
+            self.locked[self.currency] -= order.locked
+            self.balances[self.currency] += order.locked - volume
+            self.balances[self.quote] += funds - fee
+
+        order.executed_volume = volume
+        order.executed_funds = funds
+        order.paid_fee = fee
+        order.locked = 0.0
+        order.trades_count = 1
+        self.close(order, "done")
+        if order.ord_type == "limit":
+            self.fills.append(time.perf_counter())
+
+    def close(self, order: FakeOrder, state: str) -> None:
+        order.state = state
+        self.open_orders.pop(order.uuid, None)
+        message = {"type": "myOrder", "uuid": order.uuid, "state": state}
+        if state == "done":
+            message["trade_timestamp"] = int(time.time() * 1000)
+        asyncio.get_running_loop().create_task(
+            self.broadcast(self.order_clients, message)
+        )
+
+    async def broadcast(self, clients: set[web.WebSocketResponse], message: dict):
+        for ws in list(clients):
+            try:
+                await ws.send_json(message)
+            except ConnectionError:
+                clients.discard(ws)
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.request_counts[f"{request.method} {request.path}"] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+
+        group = self.group(request)
+        if group is None:
+            return await handler(request)
+
+        remaining = self.take(group)
+        if remaining < 0 or self.rng.random() < self.throttle_rate:
+            self.throttled += 1
+            return self.error(429, "too_many_requests", group=group, remaining=0)
+
+        if request.path != "/v1/ticker" and not request.path.startswith("/websocket"):
+            reason = await self.verify(request)
+            if reason is not None:
+                return self.error(401, reason, group=group, remaining=remaining)
+
+        response = await handler(request)
+        response.headers["Remaining-Req"] = self.remaining_req(group, remaining)
+        return response
+
+    def group(self, request: web.Request) -> str | None:
+        if request.path.startswith("/api/") or request.path.startswith("/websocket"):
+            return None
+        if request.path == "/v1/ticker":
+            return "quotation"
+        if request.method == "POST":
+            return "order"
+        if request.method == "DELETE" and request.path == "/v1/orders/open":
+            return "order-cancel-all"
+        return "default"
+
+    def take(self, group: str) -> int:
+        limit, window = GROUP_LIMITS[group]
+        now = time.monotonic()
+        calls = self.windows[group]
+        while calls and now - calls[0] >= window:
+            calls.popleft()
+        if len(calls) >= limit:
+            return -1
+        calls.append(now)
+        return limit - len(calls)
+
+    @staticmethod
+    def remaining_req(group: str, remaining: int) -> str:
+        return f"group={group}; min=1800; sec={remaining}"
+
+    def error(
+        self, status: int, name: str, group: str | None = None, remaining: int = 0
+    ) -> web.Response:
+        headers = {}
+        if group is not None:
+            headers["Remaining-Req"] = self.remaining_req(group, remaining)
+        return web.json_response(
+            {"error": {"name": name, "message": name}}, status=status, headers=headers
+        )
+
+    async def verify(self, request: web.Request) -> str | None:
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return "no_authorization_token"
+
+        try:
+            header, payload, signature = authorization[7:].encode("ascii").split(b".")
+            mac = hmac.new(self.secret_key, header + b"." + payload, hashlib.sha256)
+            if not hmac.compare_digest(b64decode(signature), mac.digest()):
+                return "jwt_verification"
+            claims = json.loads(b64decode(payload))
+        except ValueError:
+            return "invalid_access_key"
+
+        if claims.get("access_key") != self.access_key:
+            return "invalid_access_key"
+        nonce = claims.get("nonce")
+        if not nonce or nonce in self.nonces:
+            return "nonce_used"
+        self.nonces.add(nonce)
+
+        if request.method == "POST":
+            params = list((await request.json()).items())
+        else:
+            params = list(request.query.items())
+        if params:
+            query = unquote(urlencode(params, doseq=True)).encode("utf-8")
+            if claims.get("query_hash") != hashlib.sha512(query).hexdigest():
+                return "invalid_query_payload"
+        return None
+
+    async def get_ticker(self, request: web.Request) -> web.Response:
+        markets = request.query.get("markets", "").split(",")
+        return web.json_response(
+            [
+                {"market": market, "trade_price": self.price}
+                for market in markets
+                if market == self.market
+            ]
+        )
+
+    async def get_accounts(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {
+                    "currency": currency,
+                    "balance": str(balance),
+                    "locked": str(self.locked[currency]),
+                    "avg_buy_price": "0",
+                    "avg_buy_price_modified": False,
+                    "unit_currency": self.quote,
+                }
+                for currency, balance in self.balances.items()
+            ]
+        )
+
+    async def post_order(self, request: web.Request) -> web.Response:
+        params = await request.json()
+        if params.get("market") != self.market:
+            return self.error(400, "market_does_not_exist")
+
+        side, ord_type = params.get("side"), params.get("ord_type")
+        price = float(params["price"]) if "price" in params else None
+        volume = float(params["volume"]) if "volume" in params else None
+
+        if ord_type == "limit":
+            if price is None or volume is None:
+                return self.error(400, "validation_error")
+            if self.table.price(self.table.index(price)) != price:
+                return self.error(400, "invalid_price_bid")
+        elif ord_type == "price" and (side != "bid" or price is None):
+            return self.error(400, "validation_error")
+        elif ord_type == "market" and (side != "ask" or volume is None):
+            return self.error(400, "validation_error")
+        elif ord_type not in ("limit", "price", "market"):
+            return self.error(400, "validation_error")
+
+        if side == "bid":
+            funds = price * volume if ord_type == "limit" else price
+            currency, locked = self.quote, funds * (1 + self.fee)
+        else:
+            currency, locked = self.currency, volume
+        if locked > self.balances[currency] + 1e-9:
+            return self.error(400, f"insufficient_funds_{side}")
+
+        self.balances[currency] -= locked
+        self.locked[currency] += locked
+        order = FakeOrder(
+            market=self.market,
+            side=side,
+            ord_type=ord_type,
+            price=price,
+            volume=volume,
+            locked=locked,
+            reserved_fee=locked * self.fee if side == "bid" else 0.0,
+        )
+        self.orders[order.uuid] = order
+        self.open_orders[order.uuid] = order
+        response = order.to_json()
+
+        if ord_type == "limit":
+            self.placements.append(time.perf_counter())
+            self.match()
+        elif ord_type == "price":
+            self.fill(order, self.price, price / self.price)
+        else:
+            self.fill(order, self.price, volume)
+        return web.json_response(response, status=201)
+
+    async def get_order(self, request: web.Request) -> web.Response:
+        order = self.orders.get(request.query.get("uuid", ""))
+        if order is None:
+            return self.error(404, "order_not_found")
+        return web.json_response(order.to_json())
+
+    async def get_orders(self, request: web.Request) -> web.Response:
+        uuids = request.query.getall("uuids[]", [])
+        return web.json_response(
+            [self.orders[uuid].to_json() for uuid in uuids if uuid in self.orders]
+        )
+
+    def cancel(self, order: FakeOrder) -> None:
+        currency = self.quote if order.side == "bid" else self.currency
+        self.locked[currency] -= order.locked
+        self.balances[currency] += order.locked
+        order.locked = 0.0
+        self.close(order, "cancel")
+
+    async def delete_order(self, request: web.Request) -> web.Response:
+        order = self.orders.get(request.query.get("uuid", ""))
+        if order is None:
+            return self.error(404, "order_not_found")
+        if order.state != "wait":
+            return self.error(400, f"{order.state}_order")
+        self.cancel(order)
+        return web.json_response(order.to_json())
+
+    async def delete_open_orders(self, request: web.Request) -> web.Response:
+        pairs = request.query.get("pairs", "").split(",")
+        canceled = [o for o in self.open_orders.values() if o.market in pairs]
+        for order in canceled:
+            self.cancel(order)
+        return web.json_response(
+            {
+                "success": {
+                    "count": len(canceled),
+                    "orders": [
+                        {"uuid": order.uuid, "market": order.market}
+                        for order in canceled
+                    ],
+                },
+                "failed": {"count": 0, "orders": []},
+            }
+        )
+
+    async def get_fgi(self, request: web.Request) -> web.Response:
+        pair = f"{self.currency}/{self.quote}"
+        return web.json_response(
+            {"data": {"records": [{"pair": pair, "tradePrice": 50.0}]}}
+        )
+
+    async def ticker_ws(self, request: web.Request) -> web.WebSocketResponse:
+        return await self.serve_ws(request, self.ticker_clients)
+
+    async def order_ws(self, request: web.Request) -> web.StreamResponse:
+        reason = await self.verify(request)
+        if reason is not None:
+            return self.error(401, reason)
+        return await self.serve_ws(request, self.order_clients)
+
+    async def serve_ws(
+        self, request: web.Request, clients: set[web.WebSocketResponse]
+    ) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        clients.add(ws)
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            clients.discard(ws)
+        return ws
+
+
+def b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+async def serve(args: argparse.Namespace) -> None:
+    exchange = FakeUpbit(
+        args.access_key,
+        args.secret_key,
+        market=args.market,
+        prices=random_walk(args.price, args.volatility, args.market, args.seed),
+        tick_interval=args.tick_interval,
+        cash=args.cash,
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        streams=not args.no_streams,
+        seed=args.seed,
+    )
+    url = await exchange.start(port=args.port)
+    print(f"Fake Upbit listening on {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await exchange.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for Upbit")
+    parser.add_argument("--access-key", required=True)
+    parser.add_argument("--secret-key", required=True)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--market", default="KRW-BTC")
+    parser.add_argument("--price", type=float, default=100_000_000)
+    parser.add_argument("--volatility", type=float, default=0.002)
+    parser.add_argument("--tick-interval", type=float, default=0.05)
+    parser.add_argument("--cash", type=float, default=10_000_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--no-streams", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(serve(parser.parse_args()))
@@ -0,0 +1,45 @@
+import timeit
+import uuid as uuid_lib
+
+import jwt
+
+from app.broker import Broker
+from app.utils import JWTSigner
+
+ACCESS = "access-key-0123456789"
+SECRET = "secret-key-0123456789"
+
+
+def reference_token(query_hash: str | None, nonce: str) -> str:
+    payload = {"access_key": ACCESS, "nonce": nonce}
+    if query_hash is not None:
+        payload["query_hash"] = query_hash
+        payload["query_hash_alg"] = "SHA512"
+    return jwt.encode(payload, SECRET)
+
+
+def check_compatibility(signer: JWTSigner) -> None:
+    params = {"uuids[]": [str(uuid_lib.uuid4()), str(uuid_lib.uuid4())]}
+    for query_hash in (None, Broker.params_to_query_hash(params)):
+        nonce = str(uuid_lib.uuid4())
+        expected = reference_token(query_hash, nonce)
+        actual = signer.sign(query_hash, nonce)
+        if actual != expected:
+            raise AssertionError(f"token mismatch:\n{actual}\n{expected}")
+
+
+def main(number: int = 100_000) -> None:
+    signer = JWTSigner(ACCESS, SECRET)
+    check_compatibility(signer)
+
+    query_hash = Broker.params_to_query_hash({"uuid": str(uuid_lib.uuid4())})
+    for name, func in (
+        ("pyjwt", lambda: reference_token(query_hash, str(uuid_lib.uuid4()))),
+        ("signer", lambda: signer.sign(query_hash)),
+    ):
+        elapsed = timeit.timeit(func, number=number)
+        print(f"{name:>8}: {elapsed / number * 1e6:.2f} us/token")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import statistics
+import tempfile
+import timeit
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Coroutine
+
+import numpy as np
+import pandas as pd
+
+from app.broker import Broker
+from app.data_processor import DataProcessor
+from app.models import History, init_db
+from app.tracker import Tracker
+from app.trading_bot import TradingBot
+from app.utils import (
+    Histogram,
+    calc_ratio,
+    get_lower_price,
+    get_tick_table,
+    get_upper_price,
+)
+from app.utils.price_utils import get_price_step
+from config import config
+
+from .results import check_baseline, save_results
+
+TICKER = "KRW-BTC"
+PIVOT = 100_000_000.0
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DB_ROWS = 100_000
+
+
+@dataclass
+class Case:
+    name: str
+    func: Callable[[], Any]
+
+
+def run_sync(coro: Coroutine) -> Any:
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("coroutine suspended")
+
+
+def make_histories(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    span = np.timedelta64(80, "D").astype("timedelta64[s]").astype(int)
+    offsets = np.sort(rng.integers(0, span, n)).astype("timedelta64[s]")
+    timestamps = np.datetime64("2025-01-01T00:00:00", "ns") + offsets
+    prices = PIVOT * np.exp(np.cumsum(rng.normal(0, 0.005, n)))
+    balances = 10_000_000 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    return pd.DataFrame(
+        {
+            History.timestamp.name: timestamps,
+            History.balance.name: balances,
+            History.price.name: prices,
+            History.ratio.name: rng.uniform(0.125, 0.875, n),
+        }
+    )
+
+
+def make_bot() -> TradingBot:
+    config.pivots[TICKER] = PIVOT
+    bot = TradingBot(None, None, TICKER)  # type: ignore[arg-type]
+    bot.cash, bot.quantity, bot.last_price = 5_000_000.0, 0.05, PIVOT
+    return bot
+
+
+def pure_cases() -> list[Case]:
+    bot = make_bot()
+    table = get_tick_table(TICKER)
+    histogram = Histogram()
+    prices = [PIVOT * f for f in (0.5, 0.9, 0.995, 1.0, 1.005, 1.1, 2.0)]
+
+    return [
+        Case("calc_ratio", lambda: [calc_ratio(p, PIVOT) for p in prices]),
+        Case("get_price_step", lambda: [get_price_step(p) for p in prices]),
+        Case("get_upper_price", lambda: [get_upper_price(p) for p in prices]),
+        Case("get_lower_price", lambda: [get_lower_price(p) for p in prices]),
+        Case("calc_volume", lambda: [bot.calc_volume(p) for p in prices]),
+        Case(
+            "calc_optimal_price",
+            lambda: run_sync(bot.calc_optimal_price(PIVOT * 1.013)),
+        ),
+        Case(
+            "place_orders_walk",
+            lambda: bot.strategy.order_prices(
+                table, bot.last_price, bot.cash, bot.quantity, PIVOT
+            ),
+        ),
+        Case("histogram_record", lambda: histogram.record(0.0123)),
+    ]
+
+
+def data_cases() -> list[Case]:
+    processor = DataProcessor(None, None)  # type: ignore[arg-type]
+    cases = []
+    for label, n in SIZES.items():
+        histories = make_histories(n)
+        targets = histories[History.price.name].to_numpy()
+        cases += [
+            Case(
+                f"adaptive_sampling[{label}]",
+                lambda h=histories: processor.adaptive_sampling(h),
+            ),
+            Case(
+                f"estimate_balance_at_price[{label}]",
+                lambda t=targets: processor.estimate_balance_at_price(
+                    10_000_000, PIVOT, t, PIVOT
+                ),
+            ),
+        ]
+
+    sampled = processor.adaptive_sampling(make_histories(SIZES["100k"]))
+    cases.append(
+        Case("generate_trend_plot", lambda: processor.generate_trend_plot(sampled))
+    )
+    return cases
+
+
+def broker_cases() -> list[Case]:
+    broker = Broker()
+    params = {"uuids[]": [f"{i:08x}-0000-0000-0000-000000000000" for i in range(2)]}
+    return [
+        Case("generate_authorization", lambda: broker.generate_authorization(params))
+    ]
+
+
+async def seed_database(n: int) -> None:
+    await init_db(tempfile.mkdtemp(prefix="micro-bench-"))
+    tracker = Tracker()
+    histories = make_histories(n)
+    offset = datetime.now() - timedelta(days=81) - datetime(2025, 1, 1)
+    rows = [
+        {
+            History.market.name: TICKER,
+            History.timestamp.name: timestamp.to_pydatetime() + offset,
+            History.balance.name: balance,
+            History.price.name: price,
+            History.ratio.name: ratio,
+        }
+        for timestamp, balance, price, ratio in histories.itertuples(index=False)
+    ]
+    for i in range(0, n, 10_000):
+        await tracker.write_batch(rows[i : i + 10_000])
+
+
+def tracker_cases() -> list[Case]:
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(seed_database(DB_ROWS))
+
+    async def load() -> Tracker:
+        tracker = Tracker()
+        await tracker.initialize()
+        await tracker.close()
+        return tracker
+
+    tracker = loop.run_until_complete(load())
+    return [
+        Case("tracker_initialize", lambda: loop.run_until_complete(load())),
+        Case(
+            "get_recent_histories",
+            lambda: loop.run_until_complete(tracker.get_recent_histories(TICKER)),
+        ),
+        Case(
+            "get_rollups",
+            lambda: loop.run_until_complete(
+                tracker.get_rollups(TICKER, datetime.now() - timedelta(days=80))
+            ),
+        ),
+    ]
+
+
+def measure(case: Case, repeat: int, min_time: float) -> dict[str, float]:
+    timer = timeit.Timer(case.func)
+    number = 1
+    while timer.timeit(number) < min_time and number < 1_000_000:
+        number *= 10
+    samples = [t / number for t in timer.repeat(repeat, number)]
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for hot paths")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="fail when a median exceeds the baseline by this factor",
+    )
+    parser.add_argument("--filter", default="", help="only run matching cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    args = parser.parse_args()
+
+    cases = pure_cases() + data_cases() + broker_cases() + tracker_cases()
+    results = {}
+    for case in cases:
+        if args.filter not in case.name:
+            continue
+        results[case.name] = measure(case, args.repeat, args.min_time)
+        print(f"{case.name:>36}: {results[case.name]['median'] * 1e6:12.2f} us")
+
+    if args.out:
+        save_results(args.out, results)
+    if args.compare:
+        check_baseline(args.compare, results, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
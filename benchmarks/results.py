@@ -0,0 +1,43 @@
+import json
+import platform
+import sys
+from datetime import datetime
+
+
+def save_results(path: str, results: dict[str, dict]) -> None:
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "created_at": datetime.now().isoformat(),
+                "python": sys.version,
+                "platform": platform.platform(),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median"] / baseline[name]["median"]
+        marker = "REGRESSED" if ratio > threshold else ""
+        print(f"{name:>36}: {ratio:6.2f}x {marker}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def check_baseline(path: str, results: dict[str, dict], threshold: float) -> None:
+    with open(path) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline, threshold)
+    if regressions:
+        print(f"{len(regressions)} regressions: {', '.join(regressions)}")
+        sys.exit(1)
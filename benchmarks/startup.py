@@ -0,0 +1,101 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+from .results import check_baseline, save_results
+
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+HEAVY_MODULES = ("pandas", "matplotlib", "scipy")
+WALL_TIME = (
+    "import sys, time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start); "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+
+def import_profile(module: str) -> list[tuple[str, int, int, int]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def wall_time(module: str) -> tuple[float, list[str]]:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            WALL_TIME.format(module=module, heavy=HEAVY_MODULES),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, loaded = completed.stdout.splitlines()
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+def report(module: str, repeat: int, top: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        elapsed, loaded = wall_time(module)
+        samples.append(elapsed)
+
+    rows = import_profile(module)
+    packages: dict[str, int] = {}
+    for name, _, cumulative_us, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), cumulative_us)
+
+    print(f"import {module}: median {statistics.median(samples) * 1e3:.1f} ms")
+    print(f"  eagerly loaded heavy modules: {', '.join(loaded) or 'none'}")
+    print("  top packages by cumulative import time:")
+    for package, cumulative_us in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+        print(f"    {package:<32} {cumulative_us / 1e3:9.1f} ms")
+    print("  top modules by self import time:")
+    for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"    {name:<32} {self_us / 1e3:9.1f} ms")
+
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "repeat": repeat,
+        "heavy_modules": len(loaded),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile process startup imports")
+    parser.add_argument(
+        "modules", nargs="*", default=["app.manager", "app.data_processor"]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = {
+        f"import[{module}]": report(module, args.repeat, args.top)
+        for module in args.modules
+    }
+    if args.out:
+        save_results(args.out, results)
+    if args.compare:
+        check_baseline(args.compare, results, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
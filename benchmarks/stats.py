@@ -0,0 +1,23 @@
+import statistics
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def at(q: float) -> float:
+        return ordered[min(int(q * n), n - 1)]
+
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": at(0.50),
+        "p90": at(0.90),
+        "p99": at(0.99),
+        "max": ordered[-1],
+    }
+
+
+def format_percentiles(name: str, samples: list[float], unit: float = 1e3) -> str:
+    stats = percentiles(samples)
+    fields = " ".join(f"{k}={v * unit:.3f}" for k, v in stats.items())
+    return f"{name:>12}: {fields} (ms, n={len(samples)})"
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import time
+import uuid as uuid_lib
+from datetime import datetime
+
+import aiohttp
+from aiohttp import web
+
+from app.broker import Broker
+from app.rate_limiter import RateLimiter
+from app.transport import create_session
+from app.schemas import Order
+
+from .stats import format_percentiles
+
+
+def make_orders(n: int) -> list[dict]:
+    return [
+        {
+            "uuid": str(uuid_lib.uuid4()),
+            "side": "bid",
+            "ord_type": "limit",
+            "price": "100000000",
+            "state": "wait",
+            "market": "KRW-BTC",
+            "created_at": datetime.now().astimezone().isoformat(),
+            "volume": "0.0001",
+            "remaining_volume": "0.0001",
+            "reserved_fee": "5",
+            "remaining_fee": "5",
+            "paid_fee": "0",
+            "locked": "10005",
+            "executed_volume": "0",
+            "trades_count": 0,
+        }
+        for _ in range(n)
+    ]
+
+
+async def start_server(body: bytes) -> tuple[web.AppRunner, str]:
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/v1/orders/uuids", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def baseline(url: str, uuids: list[str], n: int) -> list[float]:
+    samples = []
+    async with aiohttp.ClientSession() as session:
+        for _ in range(n):
+            start = time.perf_counter()
+            async with session.get(
+                f"{url}/v1/orders/uuids", params={"uuids[]": uuids}
+            ) as response:
+                data = await response.json()
+            orders = [Order.model_validate(item) for item in data]
+            {order.uuid: order for order in orders}
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def tuned(url: str, uuids: list[str], n: int) -> list[float]:
+    broker = Broker(upbit_url=url)
+    broker.rate_limiter = RateLimiter({group: 1e9 for group in RateLimiter.GROUP_RATES})
+    broker.session = create_session(broker.transport)
+    samples = []
+    try:
+        for _ in range(n):
+            start = time.perf_counter()
+            await broker.get_orders(uuids)
+            samples.append(time.perf_counter() - start)
+    finally:
+        await broker.session.close()
+    return samples
+
+
+async def main(n_orders: int = 100, n_requests: int = 2000) -> None:
+    orders = make_orders(n_orders)
+    uuids = [order["uuid"] for order in orders]
+    runner, url = await start_server(json.dumps(orders).encode())
+
+    try:
+        print(format_percentiles("baseline", await baseline(url, uuids, n_requests)))
+        print(format_percentiles("broker", await tuned(url, uuids, n_requests)))
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,31 +1,151 @@
+import asyncio
 import json
+import logging
+import os
+import stat
+import tempfile
 from typing import Any
 
 from config import ConfigKeys, Env
 
+logger = logging.getLogger(__name__)
+
 
 class Config:
-    def __init__(self, filepath: str = "config.json") -> None:
+    def __init__(
+        self,
+        filepath: str = "config.json",
+        debounce: float = 1.0,
+        max_delay: float = 5.0,
+    ) -> None:
         self.filepath = filepath
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.save_handle: asyncio.TimerHandle | None = None
+        self.save_deadline = 0.0
+        self.save_tasks: set[asyncio.Task] = set()
+        self.save_lock = asyncio.Lock()
+
+        self.config: dict = {}
+        self.pivots: dict[str, float] = {}
+        self.umask: int | None = None
+
+    def load(self, filepath: str | None = None) -> None:
+        if filepath is not None:
+            self.filepath = filepath
+        if self.umask is None:
+            self.umask = os.umask(0)
+            os.umask(self.umask)
+
         self.config = self.load_config()
+        self.update_snapshot()
 
-        if ConfigKeys.PIVOT not in self.config:
-            self.set(ConfigKeys.PIVOT, Env.PIVOT)
+        if self.config.get(ConfigKeys.PIVOT) != self.pivots:
+            self.set(ConfigKeys.PIVOT, self.pivots)
 
     def load_config(self) -> dict:
+        if not os.path.exists(self.filepath):
+            logger.warning(f"{self.filepath} not found, starting from Env")
+            return {}
+
         with open(self.filepath, "r") as file:
             return json.load(file)
 
+    def update_snapshot(self) -> None:
+        pivots = self.config.get(ConfigKeys.PIVOT, {})
+        if not isinstance(pivots, dict):
+            pivots = {Env.TICKERS[0]: pivots}
+        self.pivots: dict[str, float] = {
+            ticker: float(pivots.get(ticker, pivot))
+            for ticker, pivot in Env.PIVOT.items()
+        }
+        self.pivots.update(
+            (ticker, float(pivot))
+            for ticker, pivot in pivots.items()
+            if ticker not in self.pivots
+        )
+
+    def get_pivot(self, ticker: str) -> float:
+        return self.pivots[ticker]
+
+    def set_pivot(self, ticker: str, pivot: float) -> None:
+        self.set(ConfigKeys.PIVOT, {**self.pivots, ticker: pivot})
+
+    def get_ledger(self, ticker: str) -> tuple[float, float] | None:
+        ledger = self.config.get(ConfigKeys.LEDGER, {}).get(ticker)
+        if ledger is None:
+            return None
+        return float(ledger["cash"]), float(ledger["quantity"])
+
+    def set_ledger(self, ticker: str, cash: float, quantity: float) -> None:
+        ledgers = self.config.get(ConfigKeys.LEDGER, {})
+        ledger = {"cash": cash, "quantity": quantity}
+        self.set(ConfigKeys.LEDGER, {**ledgers, ticker: ledger})
+
     def save_config(self) -> None:
-        with open(self.filepath, "w") as file:
-            json.dump(self.config, file, indent=4)
+        self.write_atomic(json.dumps(self.config, indent=4))
+
+    def write_atomic(self, data: str) -> None:
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(self.filepath):
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(self.filepath).st_mode))
+            elif self.umask is not None:
+                os.chmod(tmp_path, 0o666 & ~self.umask)
+            os.replace(tmp_path, self.filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
     def get(self, key: str, default: Any = None) -> Any:
         return self.config.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         self.config[key] = value
-        self.save_config()
+        self.update_snapshot()
+        self.schedule_save()
+
+    def schedule_save(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_config()
+            return
+
+        now = loop.time()
+        if self.save_handle is None:
+            self.save_deadline = now + self.max_delay
+        else:
+            self.save_handle.cancel()
+        when = min(now + self.debounce, self.save_deadline)
+        self.save_handle = loop.call_at(when, self.start_save)
+
+    def start_save(self) -> None:
+        self.save_handle = None
+        task = asyncio.create_task(self.save())
+        self.save_tasks.add(task)
+        task.add_done_callback(self.save_tasks.discard)
+
+    async def save(self) -> None:
+        async with self.save_lock:
+            data = json.dumps(self.config, indent=4)
+            try:
+                await asyncio.to_thread(self.write_atomic, data)
+            except Exception:
+                logger.error(f"Failed to save {self.filepath}", exc_info=True)
+
+    async def flush(self) -> None:
+        if self.save_handle is not None:
+            self.save_handle.cancel()
+            self.start_save()
+
+        if self.save_tasks:
+            await asyncio.gather(*self.save_tasks)
 
 
 config = Config()
@@ -3,3 +3,4 @@ from enum import StrEnum
 
 class ConfigKeys(StrEnum):
     PIVOT = "PIVOT"
+    LEDGER = "LEDGER"
@@ -24,6 +24,22 @@ class Env:
     SECRET = _get_required_env("SECRET")
 
     # trading
-    TICKER = _get_required_env("TICKER")
-    CURRENCY = TICKER.split("-")[1]
-    PIVOT = float(_get_required_env("PIVOT"))
+    TICKERS = [ticker.strip() for ticker in _get_required_env("TICKER").split(",")]
+    PIVOTS = [float(pivot) for pivot in _get_required_env("PIVOT").split(",")]
+    if len(PIVOTS) == 1:
+        PIVOTS *= len(TICKERS)
+    if len(PIVOTS) != len(TICKERS):
+        raise ValueError("PIVOT must have one value or one value per TICKER.")
+    PIVOT = dict(zip(TICKERS, PIVOTS))
+
+    # dashboard
+    SAMPLING = os.getenv("SAMPLING", "extrema")
+    if SAMPLING not in ("extrema", "lttb"):
+        raise ValueError("SAMPLING must be either 'extrema' or 'lttb'.")
+
+    # archive
+    ARCHIVE_DAYS = int(os.getenv("ARCHIVE_DAYS", "365"))
+
+    # metrics
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
@@ -4,7 +4,7 @@ from sqlalchemy import create_engine, inspect, text
 
 from config import Env
 from app.models.base import Base
-from app.models import History  # noqa: F401
+from app.models import History
 
 database_path = os.path.abspath(os.path.join(Env.DATA_DIR, "app.db"))
 engine = create_engine(f"sqlite:///{database_path}")
@@ -12,9 +12,14 @@ engine = create_engine(f"sqlite:///{database_path}")
 
 def migrate_and_restore():
     with engine.begin() as conn:
-        inspector = inspect(engine)
+        inspector = inspect(conn)
         if "histories" in inspector.get_table_names():
+            old_columns = [c["name"] for c in inspector.get_columns("histories")]
+            columns = ", ".join(c for c in old_columns if c in History.__table__.c)
+
             print("📦 기존 데이터를 백업합니다 (histories -> histories_old)")
+            for index in inspector.get_indexes("histories"):
+                conn.execute(text(f"DROP INDEX IF EXISTS {index['name']};"))
             conn.execute(text("ALTER TABLE histories RENAME TO histories_old;"))
 
             Base.metadata.create_all(conn)
@@ -22,9 +27,9 @@ def migrate_and_restore():
 
             print("🚀 데이터를 복구하는 중...")
             conn.execute(
-                text("""
-                INSERT INTO histories (id, timestamp, balance, price, ratio)
-                SELECT id, timestamp, balance, price, ratio FROM histories_old;
+                text(f"""
+                INSERT INTO histories ({columns})
+                SELECT {columns} FROM histories_old;
                 """)
             )
 
@@ -35,5 +40,15 @@ def migrate_and_restore():
             print("🆕 신규 테이블을 생성했습니다.")
 
 
+def tag_market():
+    with engine.begin() as conn:
+        result = conn.execute(
+            text("UPDATE histories SET market = :market WHERE market IS NULL;"),
+            {"market": Env.TICKERS[0]},
+        )
+        print(f"🏷️ {result.rowcount}건의 데이터를 {Env.TICKERS[0]} 마켓으로 태깅했습니다.")
+
+
 if __name__ == "__main__":
     migrate_and_restore()
+    tag_market()
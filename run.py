@@ -4,7 +4,7 @@ import logging
 from logging.handlers import RotatingFileHandler
 
 from app import Manager, init_db
-from config import Env
+from config import Env, config
 
 
 def setting_logger() -> None:
@@ -28,9 +28,10 @@ def setting_logger() -> None:
 
 async def main() -> None:
     setting_logger()
-    manager = Manager()
-
+    config.load()
     await init_db()
+
+    manager = Manager()
     await manager.run()
 
 
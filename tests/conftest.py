@@ -0,0 +1,7 @@
+import os
+
+os.environ.setdefault("TOKEN", "test-token")
+os.environ.setdefault("ACCESS", "test-access")
+os.environ.setdefault("SECRET", "test-secret")
+os.environ.setdefault("TICKER", "KRW-BTC")
+os.environ.setdefault("PIVOT", "100000000")
@@ -0,0 +1,54 @@
+import shutil
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.archive import HistoryArchive
+
+MARKET = "KRW-BTC"
+
+
+def history_rows(first_id: int, start: datetime, n: int) -> list[tuple]:
+    return [
+        (
+            first_id + i,
+            MARKET,
+            start + timedelta(hours=i),
+            1_000.0 + i,
+            100.0 + i,
+            0.5,
+        )
+        for i in range(n)
+    ]
+
+
+def test_memmap_spans_segments_without_concatenating(tmp_path):
+    archive = HistoryArchive(tmp_path)
+    archive.write_rows(history_rows(1, datetime(2026, 1, 31), 48))
+    archive.write_rows(history_rows(49, datetime(2026, 2, 2), 24))
+
+    columns = archive.memmap(MARKET)
+    assert isinstance(columns["price"], np.memmap)
+    assert columns["id"].tolist() == list(range(1, 73))
+    assert columns["price"][-1] == 100.0 + 23
+
+    (segment,) = archive.segments(MARKET, end=datetime(2026, 1, 31, 12))
+    assert isinstance(segment["price"], np.memmap)
+
+
+def test_interrupted_swap_keeps_the_rewritten_segment(tmp_path):
+    archive = HistoryArchive(tmp_path / "archive")
+    archive.write_rows(history_rows(1, datetime(2026, 3, 1), 3))
+    (segment,) = (tmp_path / "archive" / MARKET / "2026-03").iterdir()
+
+    rewritten = HistoryArchive(tmp_path / "rewritten")
+    rewritten.write_rows(history_rows(1, datetime(2026, 3, 1), 5))
+    shutil.copytree(
+        tmp_path / "rewritten" / MARKET / "2026-03" / segment.name,
+        segment.with_name(f".{segment.name}.partial"),
+    )
+    segment.rename(segment.with_name(f".{segment.name}.old"))
+
+    columns = archive.memmap(MARKET)
+    assert columns["id"].tolist() == [1, 2, 3, 4, 5]
+    assert [path.name for path in segment.parent.iterdir()] == [segment.name]
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from app.utils import Batcher
+
+
+def test_missing_key_fails_only_its_own_waiter():
+    async def fetch(keys: list[str]) -> dict[str, object]:
+        return {"a": 1, "c": ValueError("c vanished")}
+
+    async def lookup() -> list:
+        batcher = Batcher(fetch)
+        return await asyncio.gather(
+            batcher.get("a"),
+            batcher.get("b"),
+            batcher.get("c"),
+            return_exceptions=True,
+        )
+
+    a, b, c = asyncio.run(lookup())
+    assert a == 1
+    assert isinstance(b, ValueError)
+    assert isinstance(c, ValueError) and str(c) == "c vanished"
+
+
+def test_fetch_error_fails_the_whole_batch():
+    async def fetch(keys: list[str]) -> dict[str, int]:
+        raise RuntimeError("exchange down")
+
+    async def lookup() -> None:
+        await Batcher(fetch).get("a")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(lookup())
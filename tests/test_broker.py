@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from app.broker import APIError, Broker
+from app.utils import CircuitOpenError
+
+
+def test_persistent_429_raises_after_bounded_requeues():
+    hits = 0
+
+    async def throttled(request: web.Request) -> web.Response:
+        nonlocal hits
+        hits += 1
+        return web.json_response(
+            {"error": {"name": "too_many_requests"}},
+            status=429,
+            headers={"Remaining-Req": "group=default; min=1800; sec=0"},
+        )
+
+    async def run() -> None:
+        app = web.Application()
+        app.router.add_get("/v1/accounts", throttled)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        url = f"http://{host}:{port}"
+
+        broker = Broker(
+            upbit_url=url,
+            upbit_ws_url=f"ws://{host}:{port}/missing",
+            upbit_private_ws_url=f"ws://{host}:{port}/missing",
+            datalab_url=url,
+        )
+        broker.initialize()
+        try:
+            await broker.request("GET", f"{url}/v1/accounts", group="default")
+        finally:
+            await broker.close()
+            await runner.cleanup()
+
+    with pytest.raises(APIError) as excinfo:
+        asyncio.run(asyncio.wait_for(run(), timeout=10))
+    assert excinfo.value.status == 429
+    assert hits == Broker.MAX_REQUEUES + 1
+
+
+def test_circuit_breakers_are_per_broker():
+    opened, other = Broker(), Broker()
+    for _ in range(opened.circuits["default"].failure_threshold):
+        opened.circuits["default"].record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(opened.fetch_balances())
+    assert other.circuits["default"].state == "closed"
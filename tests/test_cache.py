@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.utils import TTLCache
+
+
+def test_concurrent_callers_share_one_load():
+    calls = 0
+
+    async def loader() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run() -> list[int]:
+        cache = TTLCache()
+        return await asyncio.gather(*(cache.get("k", loader, 60) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_other_waiters():
+    async def loader() -> str:
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run() -> str:
+        cache = TTLCache()
+        first = asyncio.create_task(cache.get("k", loader, 60))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get("k", loader, 60))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "value"
+
+
+def test_invalidate_during_load_skips_caching():
+    async def run() -> int:
+        cache = TTLCache()
+        calls = 0
+
+        async def loader() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        pending = asyncio.create_task(cache.get("k", loader, 60))
+        await asyncio.sleep(0)
+        cache.invalidate("k")
+        await pending
+        return await cache.get("k", loader, 60)
+
+    assert asyncio.run(run()) == 2
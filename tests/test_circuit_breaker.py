@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.utils import CircuitBreaker, CircuitOpenError, retry
+
+
+class Outage(Exception): ...
+
+
+def test_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_lets_a_single_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+    for _ in range(5):
+        breaker.record_failure()
+    breaker.opened_at -= 60
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_retry_counts_each_attempt_once():
+    breaker = CircuitBreaker(failure_threshold=10, reset_timeout=60)
+    calls = 0
+
+    @retry(max_attempts=3, delay=0, jitter=0, circuit_breaker=breaker)
+    async def flaky() -> None:
+        nonlocal calls
+        calls += 1
+        raise Outage
+
+    with pytest.raises(Outage):
+        asyncio.run(flaky())
+    assert calls == 3
+    assert breaker.failures == 3
+
+
+def test_open_circuit_rejects_without_calling():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+
+    @retry(circuit_breaker=breaker)
+    async def call() -> None:
+        raise AssertionError("should not be called")
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call())
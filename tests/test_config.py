@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from config.config import Config
+
+
+def test_save_is_pushed_back_by_each_change(tmp_path):
+    path = tmp_path / "config.json"
+
+    async def burst() -> list[bool]:
+        config = Config(str(path), debounce=0.1, max_delay=1.0)
+        seen = []
+        for i in range(4):
+            config.set("value", i)
+            await asyncio.sleep(0.06)
+            seen.append(path.exists())
+        await asyncio.sleep(0.15)
+        seen.append(path.exists())
+        return seen
+
+    assert asyncio.run(burst()) == [False, False, False, False, True]
+    assert json.loads(path.read_text())["value"] == 3
+
+
+def test_save_is_not_postponed_past_max_delay(tmp_path):
+    path = tmp_path / "config.json"
+
+    async def stream() -> bool:
+        config = Config(str(path), debounce=0.1, max_delay=0.3)
+        for i in range(10):
+            config.set("value", i)
+            await asyncio.sleep(0.05)
+        return path.exists()
+
+    assert asyncio.run(stream())
+
+
+def test_write_keeps_file_mode(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{}")
+    os.chmod(path, 0o644)
+
+    Config(str(path)).write_atomic(json.dumps({"value": 1}))
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert json.loads(path.read_text()) == {"value": 1}
+
+
+@pytest.mark.parametrize("sampling", ["extrema", "lttb", "ltbb"])
+def test_sampling_is_validated_at_load_time(sampling):
+    result = subprocess.run(
+        [sys.executable, "-c", "from config import Env; print(Env.SAMPLING)"],
+        cwd=Path(__file__).parents[1],
+        env={**os.environ, "SAMPLING": sampling},
+        capture_output=True,
+        text=True,
+    )
+
+    if sampling == "ltbb":
+        assert result.returncode != 0
+        assert "SAMPLING must be either 'extrema' or 'lttb'." in result.stderr
+    else:
+        assert result.stdout.strip() == sampling
+
+
+def test_new_file_mode_follows_the_umask_read_at_load(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    umask = os.umask(0o027)
+    try:
+        monkeypatch.setattr(os, "umask", None)
+        config = Config(str(path))
+        monkeypatch.undo()
+
+        config.load()
+        config.set("value", 1)
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
@@ -0,0 +1,43 @@
+import uuid
+
+import jwt
+import pytest
+
+from app.broker import Broker
+from app.utils import JWTSigner
+
+SECRET = "secret-key-0123456789"
+NONCE = "6f1c2a9e-8a8b-4c1e-9d5f-0b7c3e2a1d44"
+QUERY_HASH = Broker.params_to_query_hash(
+    {"market": "KRW-BTC", "uuids[]": ["a1b2c3", "d4e5f6"]}
+)
+
+
+def expected_payload(access_key: str, query_hash: str | None) -> dict[str, str]:
+    payload = {"access_key": access_key, "nonce": NONCE}
+    if query_hash is not None:
+        payload["query_hash"] = query_hash
+        payload["query_hash_alg"] = "SHA512"
+    return payload
+
+
+@pytest.mark.parametrize("access_key", ["access-key-0123456789", 'qu"ote-키'])
+@pytest.mark.parametrize("query_hash", [None, QUERY_HASH])
+def test_sign_matches_pyjwt(access_key, query_hash):
+    token = JWTSigner(access_key, SECRET).sign(query_hash, NONCE)
+    payload = expected_payload(access_key, query_hash)
+
+    assert token == jwt.encode(payload, SECRET, algorithm="HS256")
+    assert jwt.decode(token, SECRET, algorithms=["HS256"]) == payload
+    assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+
+def test_sign_generates_a_fresh_nonce():
+    signer = JWTSigner("access-key-0123456789", SECRET)
+    nonces = {
+        jwt.decode(signer.sign(QUERY_HASH), SECRET, algorithms=["HS256"])["nonce"]
+        for _ in range(3)
+    }
+
+    assert len(nonces) == 3
+    assert all(uuid.UUID(nonce) for nonce in nonces)
@@ -0,0 +1,44 @@
+import asyncio
+
+from app.streams import OrderStream
+
+
+def test_partial_fill_notifies_on_trade():
+    traded, closed = [], []
+    stream = OrderStream(
+        "ws://localhost",
+        lambda: "Bearer token",
+        on_closed=lambda uuid, state: closed.append((uuid, state)),
+        on_trade=traded.append,
+    )
+
+    stream.on_message({"type": "myOrder", "uuid": "a", "state": "trade"})
+    assert traded == ["a"]
+    assert closed == []
+
+    stream.on_message({"type": "myOrder", "uuid": "a", "state": "done"})
+    assert closed == [("a", "done")]
+
+
+def test_shared_waiter_survives_until_the_last_discard():
+    async def wait_twice() -> tuple[asyncio.Future[str], asyncio.Future[str]]:
+        stream = OrderStream("ws://localhost", lambda: "Bearer token")
+        first = stream.wait_closed("a")
+        second = stream.wait_closed("a")
+
+        stream.discard("a")
+        assert not second.cancelled()
+        stream.resolve("a", "done")
+        assert await second == "done"
+        stream.discard("a")
+
+        third = stream.wait_closed("b")
+        stream.wait_closed("b")
+        stream.discard("b")
+        stream.discard("b")
+        assert stream.waiters == {} and stream.references == {}
+        return first, third
+
+    first, third = asyncio.run(wait_twice())
+    assert first.result() == "done"
+    assert third.cancelled()
@@ -0,0 +1,92 @@
+import math
+
+import pytest
+
+from app.poll_scheduler import PollScheduler
+from app.utils import get_tick_table
+
+PRICE = 100_000_000.0
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr("app.poll_scheduler.time.monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def scheduler(clock) -> PollScheduler:
+    return PollScheduler(get_tick_table("KRW-BTC"))
+
+
+def ticks_away(scheduler: PollScheduler, ticks: int) -> float:
+    return scheduler.table.price(scheduler.table.index(PRICE) + ticks)
+
+
+@pytest.mark.parametrize("ticks", [1, 2])
+def test_safe_interval_is_zero_within_near_ticks(scheduler, ticks):
+    lower, upper = ticks_away(scheduler, -100), ticks_away(scheduler, 100)
+
+    assert scheduler.safe_interval(PRICE, ticks_away(scheduler, -ticks), upper) == 0
+    assert scheduler.safe_interval(PRICE, lower, ticks_away(scheduler, ticks)) == 0
+    assert scheduler.safe_interval(PRICE, PRICE, upper) == 0
+    assert scheduler.safe_interval(PRICE, ticks_away(scheduler, -3), upper) > 0
+
+
+def test_safe_interval_shrinks_with_volatility(scheduler, clock):
+    lower, upper = ticks_away(scheduler, -50), ticks_away(scheduler, 50)
+    assert scheduler.safe_interval(PRICE, lower, upper) == scheduler.max_interval
+
+    for step in range(10):
+        scheduler.observe(PRICE * (1.0005 if step % 2 else 0.9995), clock.now)
+        clock.now += 1.0
+
+    volatility = scheduler.volatility()
+    distance = math.log(upper / PRICE)
+    assert volatility > 0
+    assert scheduler.safe_interval(PRICE, lower, upper) == pytest.approx(
+        (distance / (scheduler.z_score * volatility)) ** 2
+    )
+
+
+def test_polled_backs_off_up_to_the_limit(scheduler):
+    lower, upper = ticks_away(scheduler, -50), ticks_away(scheduler, 50)
+    scheduler.schedule(PRICE, lower, upper)
+    assert scheduler.limit == scheduler.max_interval
+
+    intervals = [scheduler.polled() for _ in range(8)]
+    assert intervals == [0.5, 1.0, 2.0, 4.0, 8.0, 8.0, 8.0, 8.0]
+
+    scheduler.limit = 3.0
+    assert [scheduler.polled() for _ in range(3)] == [3.0, 3.0, 3.0]
+
+
+def test_reset_and_schedule_respect_the_interval_bounds(scheduler, clock):
+    lower, upper = ticks_away(scheduler, -50), ticks_away(scheduler, 50)
+    for _ in range(5):
+        scheduler.polled()
+
+    scheduler.reset()
+    assert scheduler.interval == scheduler.min_interval
+    assert scheduler.schedule(PRICE, lower, upper) == scheduler.min_interval
+
+    near = ticks_away(scheduler, -1)
+    assert scheduler.schedule(PRICE, near, upper) == scheduler.min_interval
+    assert scheduler.limit == scheduler.min_interval
+
+    clock.now += 1.0
+    assert scheduler.schedule(PRICE, near, upper) == 0.0
+
+    scheduler.interval = 100.0
+    scheduler.schedule(PRICE, lower, upper)
+    assert scheduler.limit == scheduler.max_interval
+    assert scheduler.schedule(PRICE, lower, upper) == scheduler.max_interval - 1.0
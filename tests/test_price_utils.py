@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from app.strategy import GridStrategy
+from app.utils import TickTable, gallop
+
+STEPS = [0.001, 0.01, 0.1, 1, 5, 10, 50, 100, 500, 1_000]
+
+
+def random_table(rng: random.Random) -> TickTable:
+    bands, bound = [], 0.0
+    for step in sorted(rng.sample(STEPS, rng.randint(1, 6))):
+        bands.append((bound, step))
+        bound += rng.randint(5, 200) * step
+    return TickTable(bands)
+
+
+def random_index(rng: random.Random, table: TickTable) -> int:
+    top = max(table.starts[-1], 2)
+    return rng.choice(
+        [1, 2, top - 1, top, top + 1, rng.randint(1, top + 500), top + 500]
+    )
+
+
+def linear_scan(predicate, start: int = 0, limit: int | None = None) -> int | None:
+    n = start
+    while limit is None or n <= limit:
+        if predicate(n):
+            return n
+        n += 1
+    return None
+
+
+def linear_optimal_price(
+    strategy: GridStrategy,
+    table: TickTable,
+    cur_price: float,
+    cash: float,
+    quantity: float,
+    pivot_price: float,
+) -> float:
+    def gap(price: float) -> float:
+        return abs(strategy.calc_volume(price, cash, quantity, pivot_price))
+
+    min_volume = gap(cur_price)
+    optimal_price = cur_price
+    for direction in (-1, 1):
+        index = table.index(cur_price)
+        while True:
+            index += direction
+            if index <= 0:
+                break
+            price = table.price(index)
+            if gap(price) >= min_volume:
+                break
+            min_volume, optimal_price = gap(price), price
+    return optimal_price
+
+
+def linear_order_prices(
+    strategy: GridStrategy,
+    table: TickTable,
+    last_price: float,
+    cash: float,
+    quantity: float,
+    pivot_price: float,
+) -> tuple[float | None, float | None]:
+    last_index = table.index(last_price)
+    lower_price = upper_price = None
+
+    for index in range(last_index, 0, -1):
+        price = table.price(index)
+        volume = strategy.calc_volume(price, cash, quantity, pivot_price)
+        if strategy.is_profitable_order(last_price, price, volume):
+            lower_price = price
+            break
+
+    index = last_index
+    while upper_price is None:
+        price = table.price(index)
+        volume = -strategy.calc_volume(price, cash, quantity, pivot_price)
+        if strategy.is_profitable_order(last_price, price, volume):
+            upper_price = price
+        index += 1
+    return lower_price, upper_price
+
+
+def random_balances(rng: random.Random, price: float) -> tuple[float, float, float]:
+    cash = rng.choice([0.0, rng.uniform(0, 10_000_000)])
+    quantity = rng.uniform(0.1, 10_000_000) / price
+    pivot_price = price * rng.choice([0.25, rng.uniform(0.5, 2.0), 4.0])
+    return cash, quantity, pivot_price
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_gallop_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        threshold = rng.randint(0, 300)
+        start = rng.randint(0, 10)
+        limit = rng.choice([None, rng.randint(start, 300)])
+        predicate = threshold.__le__
+
+        assert gallop(predicate, start, limit) == linear_scan(predicate, start, limit)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimal_price_matches_linear_walk(seed):
+    rng = random.Random(seed)
+    strategy = GridStrategy()
+    for _ in range(25):
+        table = random_table(rng)
+        cur_price = table.price(random_index(rng, table))
+        args = (table, cur_price, *random_balances(rng, cur_price))
+
+        assert strategy.optimal_price(*args) == linear_optimal_price(strategy, *args)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_order_prices_match_linear_walk(seed):
+    rng = random.Random(seed)
+    strategy = GridStrategy()
+    for _ in range(25):
+        table = random_table(rng)
+        last_price = table.price(random_index(rng, table))
+        args = (table, last_price, *random_balances(rng, last_price))
+
+        assert strategy.order_prices(*args) == linear_order_prices(strategy, *args)
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.rate_limiter import RateLimiter, TokenBucket
+
+
+@pytest.mark.parametrize("group", list(RateLimiter.GROUP_RATES))
+def test_acquire_from_every_group(group):
+    async def acquire() -> None:
+        limiter = RateLimiter()
+        await asyncio.wait_for(limiter.acquire(group), timeout=1)
+
+    asyncio.run(acquire())
+
+
+def test_fractional_rate_holds_a_whole_token():
+    async def acquire_twice() -> float:
+        bucket = TokenBucket(0.5)
+        loop = asyncio.get_running_loop()
+        await asyncio.wait_for(bucket.acquire(), timeout=1)
+        start = loop.time()
+        await asyncio.wait_for(bucket.acquire(), timeout=3)
+        return loop.time() - start
+
+    assert 1.5 <= asyncio.run(acquire_twice()) <= 2.5
+
+
+def test_throttle_empties_the_bucket():
+    async def throttled() -> bool:
+        limiter = RateLimiter({"order": 100.0})
+        limiter.throttle("order")
+        try:
+            await asyncio.wait_for(limiter.acquire("order"), timeout=0.001)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(throttled())
+
+
+def test_bursts_stay_within_the_window():
+    async def acquire_all() -> list[float]:
+        bucket = TokenBucket(100.0, capacity=10)
+        loop = asyncio.get_running_loop()
+        granted = []
+        for _ in range(30):
+            await asyncio.wait_for(bucket.acquire(), timeout=1)
+            granted.append(loop.time())
+        return granted
+
+    granted = asyncio.run(acquire_all())
+    assert all(
+        later - earlier >= 0.099 for earlier, later in zip(granted, granted[10:])
+    )
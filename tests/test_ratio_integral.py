@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from app.utils import calc_ratio, log_balance_change
+from app.utils.ratio_integral import LN2, MAX_OCTAVE, MIN_OCTAVE
+
+PIVOT = 100_000_000.0
+TOLERANCE = 1e-12
+EDGES = [MIN_OCTAVE * LN2, 0.0, MAX_OCTAVE * LN2]
+DOMAIN = np.concatenate([np.linspace(MIN_OCTAVE * LN2, MAX_OCTAVE * LN2, 301), EDGES])
+OUTSIDE = [-12 * LN2, (MIN_OCTAVE - 1) * LN2, (MAX_OCTAVE + 1) * LN2, 4 * LN2]
+
+
+def quad_log_balance_change(cur_price: float, target_price: float) -> float:
+    def integrand(price: float) -> float:
+        return (1 - calc_ratio(price, PIVOT)) / price
+
+    low, high = sorted((cur_price, target_price))
+    kinks = [price for price in (PIVOT, 2 * PIVOT) if low < price < high]
+    integral, _ = quad(
+        integrand,
+        cur_price,
+        target_price,
+        points=kinks or None,
+        epsabs=TOLERANCE,
+        epsrel=TOLERANCE,
+        limit=200,
+    )
+    return integral
+
+
+@pytest.mark.parametrize("cur_ratio", [1.0, 2**-3.3, 1.7])
+@pytest.mark.parametrize("region", ["domain", "outside"])
+def test_table_matches_quad(cur_ratio, region):
+    cur_price = PIVOT * cur_ratio
+    targets = PIVOT * np.exp(DOMAIN if region == "domain" else OUTSIDE)
+
+    table = log_balance_change(cur_price, targets, PIVOT)
+    for target_price, change in zip(targets, table):
+        expected = quad_log_balance_change(cur_price, target_price)
+        assert change == pytest.approx(expected, abs=TOLERANCE)
+
+
+def test_outside_the_domain_extends_linearly():
+    def change(u_cur: float, u_target: float) -> float:
+        cur_price, target_price = PIVOT * math.exp(u_cur), PIVOT * math.exp(u_target)
+        return log_balance_change(cur_price, target_price, PIVOT)
+
+    above = change(MAX_OCTAVE * LN2, MAX_OCTAVE * LN2 + 3)
+    below = change(MIN_OCTAVE * LN2 - 3, MIN_OCTAVE * LN2)
+
+    assert above == pytest.approx(0.125 * 3, abs=TOLERANCE)
+    assert below == pytest.approx(3, abs=TOLERANCE)
+    assert np.isfinite(log_balance_change(PIVOT, [1e-3, 1e20], PIVOT)).all()
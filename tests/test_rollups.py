@@ -0,0 +1,166 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+from app.data_processor import DataProcessor
+from app.models import (
+    ROLLUPS,
+    DayRollup,
+    History,
+    HourRollup,
+    MinuteRollup,
+    SessionLocal,
+    database,
+    init_db,
+)
+from app.rollups import aggregate, query_rollups, select_rollup, upsert_rollups
+
+TICKER = "KRW-BTC"
+START = datetime(2026, 3, 1, 9, 0)
+
+
+def history_rows(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    timestamp, rows = START, []
+    for _ in range(n):
+        timestamp += timedelta(seconds=rng.randint(1, 600))
+        rows.append(
+            {
+                History.market.name: TICKER,
+                History.timestamp.name: timestamp,
+                History.balance.name: rng.uniform(9e6, 11e6),
+                History.price.name: rng.uniform(9e7, 11e7),
+                History.ratio.name: rng.random(),
+            }
+        )
+    return rows
+
+
+def recompute(rows: list[dict], resolution: timedelta) -> dict[datetime, dict]:
+    bars: dict[datetime, list[dict]] = {}
+    for row in rows:
+        seconds = (row["timestamp"] - datetime(1970, 1, 1)) // resolution
+        bars.setdefault(datetime(1970, 1, 1) + seconds * resolution, []).append(row)
+    return {
+        bucket: {
+            "price_open": group[0]["price"],
+            "price_high": max(row["price"] for row in group),
+            "price_low": min(row["price"] for row in group),
+            "price_close": group[-1]["price"],
+            "balance_open": group[0]["balance"],
+            "balance_high": max(row["balance"] for row in group),
+            "balance_low": min(row["balance"] for row in group),
+            "balance_close": group[-1]["balance"],
+            "ratio": group[-1]["ratio"],
+            "trades": len(group),
+        }
+        for bucket, group in bars.items()
+    }
+
+
+def with_database(tmp_path, func):
+    async def run():
+        await init_db(str(tmp_path))
+        try:
+            return await func()
+        finally:
+            await database.engine.dispose()
+            database.engine = None
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("model", ROLLUPS)
+def test_aggregate_matches_a_recompute(model):
+    rows = history_rows(500)
+    bars = aggregate(rows, model.resolution)
+
+    expected = recompute(rows, model.resolution)
+    assert {bar["bucket"]: bar for bar in bars}.keys() == expected.keys()
+    for bar in bars:
+        assert {key: bar[key] for key in expected[bar["bucket"]]} == pytest.approx(
+            expected[bar["bucket"]]
+        )
+
+
+def test_overlapping_batches_merge_into_the_same_bars(tmp_path):
+    rows = history_rows(400, seed=1)
+
+    async def write_and_read() -> dict:
+        for batch in (rows[:217], rows[217:]):
+            async with SessionLocal() as session:
+                await upsert_rollups(session, batch)
+                await session.commit()
+
+        stored = {}
+        async with SessionLocal() as session:
+            for model in ROLLUPS:
+                result = await session.execute(select(model))
+                stored[model] = {bar.bucket: bar for bar in result.scalars()}
+        return stored
+
+    stored = with_database(tmp_path, write_and_read)
+
+    for model in ROLLUPS:
+        expected = recompute(rows, model.resolution)
+        assert stored[model].keys() == expected.keys()
+        for bucket, bar in stored[model].items():
+            assert {key: getattr(bar, key) for key in expected[bucket]} == (
+                pytest.approx(expected[bucket])
+            )
+
+
+def test_select_rollup_picks_the_finest_table_within_max_points(tmp_path):
+    rows = history_rows(400, seed=2)
+    end = rows[-1]["timestamp"]
+
+    async def select_models() -> list:
+        async with SessionLocal() as session:
+            await upsert_rollups(session, rows)
+            await session.commit()
+
+            return [
+                await select_rollup(session, TICKER, end - span, end, max_points)
+                for span, max_points in (
+                    (timedelta(hours=2), 480),
+                    (timedelta(days=30), 480),
+                    (timedelta(days=30), 10),
+                )
+            ] + [(await query_rollups(TICKER, START, end, 60))[0]]
+
+    models = with_database(tmp_path, select_models)
+    assert models == [MinuteRollup, MinuteRollup, DayRollup, HourRollup]
+
+
+class RollupTracker:
+    def __init__(self, rollups: pd.DataFrame) -> None:
+        self.rollups = rollups
+
+    async def get_rollups(self, market, start, end=None, max_points=480):
+        return self.rollups
+
+
+def test_dashboard_trend_reads_rollups():
+    histories = pd.DataFrame(history_rows(50)).drop(columns="market")
+    rollups = pd.DataFrame(
+        {
+            "bucket": [START, START + timedelta(hours=1)],
+            "price_close": [1.0, 2.0],
+            "balance_close": [3.0, 4.0],
+            "ratio": [0.25, 0.5],
+        }
+    )
+
+    trend = asyncio.run(
+        DataProcessor(None, RollupTracker(rollups)).trend_histories(TICKER, histories)
+    )
+    assert trend["price"].tolist() == [1.0, 2.0]
+    assert trend["balance"].tolist() == [3.0, 4.0]
+
+    processor = DataProcessor(None, RollupTracker(rollups.iloc[:0]))
+    fallback = asyncio.run(processor.trend_histories(TICKER, histories))
+    assert fallback is histories
@@ -0,0 +1,71 @@
+import asyncio
+
+from aiohttp import web
+
+from app.broker import Broker
+
+TICKER = "KRW-BTC"
+STREAM_PRICE = 100_000_000.0
+REST_PRICE = 101_000_000.0
+
+
+async def stalled_ticker_ws(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    async for _ in ws:
+        await ws.send_json(
+            {"type": "ticker", "code": TICKER, "trade_price": STREAM_PRICE}
+        )
+        break
+    async for _ in ws:
+        pass
+    return ws
+
+
+async def rest_ticker(request: web.Request) -> web.Response:
+    return web.json_response([{"market": TICKER, "trade_price": REST_PRICE}])
+
+
+async def serve() -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get("/websocket/v1", stalled_ticker_ws)
+    app.router.add_get("/v1/ticker", rest_ticker)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+def test_stalled_stream_falls_back_to_rest():
+    async def run() -> tuple[float, float, bool]:
+        runner, url = await serve()
+        ws_url = url.replace("http", "ws", 1)
+        broker = Broker(
+            upbit_url=url,
+            upbit_ws_url=f"{ws_url}/websocket/v1",
+            upbit_private_ws_url=f"{ws_url}/websocket/v1/missing",
+            datalab_url=url,
+        )
+        broker.ticker_stream.stale_after = 0.2
+        broker.initialize()
+        try:
+            while not broker.ticker_stream.is_connected():
+                await asyncio.sleep(0.01)
+            await broker.ticker_stream.subscribe(TICKER)
+            while broker.ticker_stream.get_price(TICKER) is None:
+                await asyncio.sleep(0.01)
+            fresh = await broker.get_current_price(TICKER)
+
+            await asyncio.sleep(0.3)
+            stale = await broker.get_current_price(TICKER)
+            return fresh, stale, broker.ticker_stream.is_connected()
+        finally:
+            await broker.close()
+            await runner.cleanup()
+
+    fresh, stale, connected = asyncio.run(asyncio.wait_for(run(), timeout=10))
+    assert fresh == STREAM_PRICE
+    assert connected
+    assert stale == REST_PRICE
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import delete
+
+from app.models import History, SessionLocal, database, init_db
+from app.tracker import Tracker
+
+TICKER = "KRW-BTC"
+
+
+class FlakyDatabase:
+    def __init__(self) -> None:
+        self.down = False
+        self.written: list[list[float]] = []
+
+    async def write_batch(self, batch: list[dict]) -> None:
+        prices = [record["price"] for record in batch]
+        if self.down or any(price < 0 for price in prices):
+            raise ConnectionError("database unavailable")
+        self.written.append(prices)
+
+
+def run_tracker(tmp_path, database: FlakyDatabase, trades) -> Tracker:
+    async def record() -> Tracker:
+        tracker = Tracker(spill_path=str(tmp_path / "history.spill.jsonl"))
+        tracker.write_batch = database.write_batch
+        tracker.writer = asyncio.create_task(tracker.write_behind())
+
+        for price, down in trades:
+            database.down = down
+            await tracker.record_trade(TICKER, 1_000.0, price, 0.5)
+            await tracker.queue.join()
+        await tracker.close()
+        return tracker
+
+    return asyncio.run(record())
+
+
+def test_spilled_batches_replay_in_order_after_an_outage(tmp_path):
+    database = FlakyDatabase()
+    tracker = run_tracker(
+        tmp_path, database, [(100.0, True), (101.0, True), (102.0, False)]
+    )
+
+    assert database.written == [[100.0], [101.0], [102.0]]
+    assert tracker.load_spilled() == []
+
+
+def test_unreplayable_batches_are_quarantined(tmp_path):
+    database = FlakyDatabase()
+    tracker = run_tracker(
+        tmp_path, database, [(-1.0, False), (101.0, False), (102.0, False)]
+    )
+
+    assert database.written == [[101.0], [102.0]]
+    assert tracker.load_spilled() == []
+    quarantine = (tmp_path / "history.spill.jsonl.quarantine").read_text()
+    assert len(quarantine.splitlines()) == 1
+    assert '"price": -1.0' in quarantine
+
+
+def test_corrupt_spill_lines_are_skipped(tmp_path):
+    tracker = Tracker(spill_path=str(tmp_path / "history.spill.jsonl"))
+    timestamp = datetime(2026, 1, 2, 3, 4, 5)
+    record = {
+        "id": 7,
+        "market": TICKER,
+        "timestamp": timestamp,
+        "balance": 1_000.0,
+        "price": 100.0,
+        "ratio": 0.5,
+    }
+    tracker.write_spilled([[record]])
+    with open(tracker.spill_path, "a") as f:
+        f.write('[{"id": 8, "market"\n')
+
+    assert tracker.load_spilled() == [[record]]
+
+
+def test_close_spills_the_queue_when_the_writer_died(tmp_path):
+    async def crashed_writer() -> None:
+        raise RuntimeError("writer crashed")
+
+    async def record() -> Tracker:
+        tracker = Tracker(spill_path=str(tmp_path / "history.spill.jsonl"))
+        tracker.writer = asyncio.create_task(crashed_writer())
+        await asyncio.sleep(0)
+        for price in (100.0, 101.0):
+            await tracker.record_trade(TICKER, 1_000.0, price, 0.5)
+        await asyncio.wait_for(tracker.close(), timeout=1)
+        return tracker
+
+    tracker = asyncio.run(record())
+
+    (batch,) = tracker.load_spilled()
+    assert [record["price"] for record in batch] == [100.0, 101.0]
+
+
+def test_ids_keep_increasing_after_every_row_is_archived(tmp_path):
+    async def restart_after_archiving() -> int:
+        await init_db(str(tmp_path))
+        try:
+            tracker = Tracker()
+            await tracker.initialize()
+            for price in (100.0, 101.0, 102.0):
+                await tracker.record_trade(TICKER, 1_000.0, price, 0.5)
+            await tracker.close()
+
+            async with SessionLocal() as session:
+                await session.execute(delete(History))
+                await session.commit()
+
+            restarted = Tracker()
+            await restarted.initialize()
+            await restarted.close()
+            return restarted.next_id
+        finally:
+            await database.engine.dispose()
+            database.engine = None
+
+    assert asyncio.run(restart_after_archiving()) == 4
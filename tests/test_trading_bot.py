@@ -0,0 +1,170 @@
+import asyncio
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app.streams import OrderStream, TickerStream
+from app.trading_bot import TradingBot
+from app.utils import CircuitOpenError
+from config import config
+
+TICKER = "KRW-BTC"
+PRICE = 100_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path):
+    config.load(str(tmp_path / "config.json"))
+    config.pivots[TICKER] = PRICE
+
+
+class FlakyBroker:
+    def __init__(self) -> None:
+        self.bot: TradingBot | None = None
+        self.placed = 0
+        self.cancelled = 0
+
+    async def cancel_orders(self, ticker: str) -> None:
+        self.cancelled += 1
+
+    async def get_balances(self) -> dict:
+        return {
+            "KRW": SimpleNamespace(balance=5_000_000.0, locked=0.0),
+            "BTC": SimpleNamespace(balance=0.05, locked=0.0),
+        }
+
+    async def get_current_price(self, ticker: str) -> float:
+        return PRICE
+
+    async def buy_limit_order(self, ticker: str, price: float, volume: float):
+        self.placed += 1
+        if self.placed == 1:
+            raise CircuitOpenError("place_order rejected: circuit open")
+        return SimpleNamespace(uuid="buy")
+
+    async def sell_limit_order(self, ticker: str, price: float, volume: float):
+        self.bot.state = TradingBot.State.STOPPING
+        raise CircuitOpenError("place_order rejected: circuit open")
+
+
+def test_run_waits_out_open_circuit():
+    broker = FlakyBroker()
+    bot = TradingBot(broker, None, TICKER)  # type: ignore[arg-type]
+    bot.CIRCUIT_WAIT = 0
+    bot.cash, bot.quantity, bot.last_price = 5_000_000.0, 0.05, PRICE
+    bot.state = TradingBot.State.RUNNING
+    broker.bot = bot
+
+    asyncio.run(bot.run())
+
+    assert bot.is_terminated()
+    assert broker.placed == 2
+    assert broker.cancelled == 1
+
+
+class AccountBroker:
+    def __init__(self, krw: float, btc: float) -> None:
+        self.krw, self.btc = krw, btc
+        self.orders: dict[str, SimpleNamespace] = {}
+
+    async def get_balances(self) -> dict:
+        return {
+            "KRW": SimpleNamespace(balance=self.krw, locked=0.0),
+            "BTC": SimpleNamespace(balance=self.btc, locked=0.0),
+        }
+
+    async def get_orders(self, uuids: list[str]) -> dict:
+        return {uuid: self.orders[uuid] for uuid in uuids if uuid in self.orders}
+
+    def fill(self, uuid: str, side: str, price: float, volume: float) -> None:
+        funds, fee = price * volume, price * volume * 0.0005
+        self.krw += -funds - fee if side == "bid" else funds - fee
+        self.btc += volume if side == "bid" else -volume
+        self.orders[uuid] = SimpleNamespace(
+            side=side,
+            ord_type="limit",
+            price=price,
+            executed_volume=volume,
+            executed_funds=funds,
+            paid_fee=fee,
+        )
+
+
+def test_single_bot_follows_the_exchange_balance():
+    broker = AccountBroker(krw=10_000_000.0, btc=0.0)
+    bot = TradingBot(broker, None, TICKER)  # type: ignore[arg-type]
+
+    asyncio.run(bot.update_balance(PRICE))
+    broker.krw += 1_000_000.0
+    asyncio.run(bot.update_balance(PRICE))
+
+    assert bot.cash == 11_000_000.0
+    assert config.get_ledger(TICKER) is None
+
+
+def test_shared_account_ledger_settles_actual_fills():
+    broker = AccountBroker(krw=10_000_000.0, btc=0.0)
+    bot = TradingBot(broker, None, TICKER, cash_share=0.5)  # type: ignore[arg-type]
+
+    asyncio.run(bot.update_balance(PRICE))
+    assert bot.cash == 5_000_000.0
+
+    broker.krw -= 3_000_000.0
+    asyncio.run(bot.update_balance(PRICE))
+    assert bot.cash == 5_000_000.0
+
+    broker.fill("buy", "bid", PRICE * 0.99, 0.01)
+    asyncio.run(bot.update_balance(PRICE, "buy", "sell"))
+    order = broker.orders["buy"]
+    assert bot.cash == pytest.approx(
+        5_000_000.0 - order.executed_funds - order.paid_fee
+    )
+    assert bot.quantity == 0.01
+
+
+def test_ledger_survives_a_crash_after_a_fill(tmp_path):
+    path = str(tmp_path / "config.json")
+    broker = AccountBroker(krw=10_000_000.0, btc=0.0)
+    bot = TradingBot(broker, None, TICKER, cash_share=0.5)  # type: ignore[arg-type]
+    asyncio.run(bot.update_balance(PRICE))
+
+    broker.fill("buy", "bid", PRICE, 0.01)
+    asyncio.run(bot.update_balance(PRICE, "buy"))
+    expected = bot.cash
+
+    config.load(path)
+    restarted = TradingBot(broker, None, TICKER, 0.5)  # type: ignore[arg-type]
+    asyncio.run(restarted.update_balance(PRICE * 1.1))
+    assert restarted.cash == pytest.approx(expected)
+
+    broker.fill("sell", "ask", PRICE * 1.1, 0.004)
+    config.load(path)
+    restarted = TradingBot(broker, None, TICKER, 0.5)  # type: ignore[arg-type]
+    asyncio.run(restarted.update_balance(PRICE * 1.1))
+    assert restarted.cash == pytest.approx(expected + 0.004 * PRICE * 1.1)
+    assert restarted.quantity == pytest.approx(0.006)
+
+
+def test_connected_stream_prices_feed_the_poll_scheduler():
+    order_stream = OrderStream("ws://localhost", lambda: "Bearer token")
+    order_stream.is_connected = lambda: True
+    ticker_stream = TickerStream("ws://localhost")
+    broker = SimpleNamespace(order_stream=order_stream, ticker_stream=ticker_stream)
+    bot = TradingBot(broker, None, TICKER)  # type: ignore[arg-type]
+    bot.PRICE_INTERVAL = 0.01
+    bot.state = TradingBot.State.RUNNING
+
+    async def wait_for_fill() -> tuple[bool, bool | None]:
+        ticker = {"type": "ticker", "code": TICKER, "trade_price": PRICE}
+        ticker_stream.on_message(ticker)
+        waiting = asyncio.create_task(
+            bot.wait_any_closed("buy", "sell", PRICE * 0.99, PRICE * 1.01)
+        )
+        await asyncio.sleep(0.05)
+        order_stream.resolve("buy", "done")
+        return await waiting
+
+    assert asyncio.run(wait_for_fill()) == (True, True)
+    assert len(bot.poll_scheduler.samples) >= 2
+    assert {price for _, price in bot.poll_scheduler.samples} == {math.log(PRICE)}